@@ -16,13 +16,35 @@ Options:
     --all         Run all checks (default)
     --verbose     Show detailed output
     --fix         Suggest fixes for broken references
+    --publications   Lint Meteor.publish bodies for unbounded / unprojected cursors
+    --n-plus-one     Find database calls inside loops in methods and server code
+    --resource-leaks Find unbounded or unstopped observers and unguarded intervals
+    --blocking-work  Find methods and publications that call CPU-heavy packages
+    --perf           Run all Meteor performance rule packs
+    --critical-path  Report eager startup import chains and transitive fan-in
+    --index-advisor  Report queried field combinations with no supporting index
+    --baseline FILE  Only report (and fail on) findings not in the baseline
+    --update-baseline  Write the current findings to the --baseline file
+    --move OLD NEW   Move a file or directory and rewrite every import of it
+    --affected FILE...    Entry points, pages and tests depending on the given files
+    --affected-since REF  Same, for the files changed since a git ref
+    --serve [--socket PATH]  JSON-RPC query server (resolve, importers,
+                     importers-transitive, exports, broken) over stdio or a Unix socket
 """
 
 import os
 import re
+import ast
 import sys
 import json
+import heapq
+import bisect
+import hashlib
 import argparse
+import shutil
+import socketserver
+import subprocess
+import time
 from pathlib import Path
 from collections import defaultdict, deque
 from typing import Dict, List, Set, Tuple, Optional
@@ -37,17 +59,41 @@ from rich import print as rich_print
 console = Console()
 
 class RefChecker:
-    def __init__(self, root_dir: str = ".", verbose: bool = False, fix: bool = False):
+    def __init__(self, root_dir: str = ".", verbose: bool = False, fix: bool = False,
+                 ignore_dirs: Optional[Set[str]] = None, use_git: bool = True,
+                 index_path: Optional[str] = None):
         self.root_dir = Path(root_dir).resolve()
         self.verbose = verbose
         self.fix = fix
+        self.use_git = use_git
         self.errors = []
         self.warnings = []
         self.suggestions = []
 
+        # Baseline of known findings (fingerprints) that should not be reported again
+        self.baseline = set()
+        self.baselined_count = 0
+        self.seen_findings = {}
+
         # File patterns to check
         self.js_extensions = {'.js', '.jsx', '.ts', '.tsx', '.mjs'}
 
+        # Directories never descended into while looking for source files
+        self.ignore_dirs = {'node_modules', '.meteor', '.git', 'build', 'dist', '.next', 'coverage'}
+        if ignore_dirs:
+            self.ignore_dirs.update(ignore_dirs)
+        self.js_files_cache = None
+        self.walk_stats = {}
+
+        # Import index persisted between runs, keyed by root-relative path and (mtime, size)
+        self.resolve_cache = {}
+        self.exports_cache = {}
+        self.source_cache = {}
+        self.heavy_cache = {}
+        self.index_path = Path(index_path) if index_path else self.default_index_path()
+        self.import_index = None
+        self.import_index_dirty = False
+
         # Node.js built-in modules
         self.builtin_modules = {
             'assert', 'async_hooks', 'buffer', 'child_process', 'cluster',
@@ -66,7 +112,16 @@ class RefChecker:
             r'import\s+(?:(?:\{[^}]+\}|\w+|\*\s+as\s+\w+)(?:\s*,\s*(?:\{[^}]+\}|\w+))*\s+from\s+)?["\']([^"\']+)["\']',
             r'require\s*\(\s*["\']([^"\']+)["\']\s*\)',
             r'import\s*\(\s*["\']([^"\']+)["\']\s*\)',
+            # Closing line of a multi-line import { ... } / export { ... } block
+            r'^\s*\}\s*from\s+["\']([^"\']+)["\']',
+            # Re-exports: export * from / export { A } from
+            r'export\s+(?:\*(?:\s+as\s+\w+)?|\{[^}]*\})\s*from\s+["\']([^"\']+)["\']',
         ]
+        # import/require are evaluated eagerly; dynamic import() is deferred until called
+        self.static_import_patterns = [p for p in self.import_patterns if not p.startswith(r'import\s*\(')]
+
+        # Packages whose calls are CPU-bound and block every other client on the server
+        self.heavy_packages = ['sharp', 'jsdom', 'canvas', 'svg-captcha']
 
         self.component_pattern = r'(?:export\s+default\s+(?:function\s+)?(\w+)|export\s+(?:const|function)\s+(\w+)|class\s+(\w+)\s+extends)'
 
@@ -85,16 +140,87 @@ class RefChecker:
             color = color_map.get(level, "white")
             console.print(f"[{color}][{level}][/{color}] {message}")
 
-    def add_error(self, message: str):
-        """Add error to results"""
+    def add_error(self, message: str, kind: Optional[str] = None, file: Optional[str] = None,
+                  specifier: Optional[str] = None):
+        """Add error to results (skipped when its fingerprint is in the baseline)"""
+        if self.record_finding(message, "error", kind, file, specifier):
+            return
         self.errors.append(message)
         self.log(message, "ERROR")
 
-    def add_warning(self, message: str):
-        """Add warning to results"""
+    def add_warning(self, message: str, kind: Optional[str] = None, file: Optional[str] = None,
+                    specifier: Optional[str] = None):
+        """Add warning to results (skipped when its fingerprint is in the baseline)"""
+        if self.record_finding(message, "warning", kind, file, specifier):
+            return
         self.warnings.append(message)
         self.log(message, "WARNING")
 
+    def relative_path_str(self, file_path: Path) -> str:
+        """Root-relative path string, falling back to the path itself outside the root"""
+        try:
+            return str(Path(file_path).resolve().relative_to(self.root_dir))
+        except ValueError:
+            return str(file_path)
+
+    def finding_fingerprint(self, message: str, kind: Optional[str] = None, file: Optional[str] = None,
+                            specifier: Optional[str] = None) -> str:
+        """Stable fingerprint of a finding: (file, specifier, kind), ignoring line numbers"""
+        if kind is None:
+            # Unstructured findings fall back to the message with line numbers removed
+            kind, file, specifier = "message", "", re.sub(r':\d+\b', '', message)
+        key = "\0".join([kind, file or "", specifier or ""])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    def record_finding(self, message: str, level: str, kind: Optional[str], file: Optional[str],
+                       specifier: Optional[str]) -> bool:
+        """Remember a finding for --update-baseline, returns True if it is already baselined"""
+        fingerprint = self.finding_fingerprint(message, kind, file, specifier)
+        self.seen_findings[fingerprint] = {
+            "fingerprint": fingerprint,
+            "level": level,
+            "kind": kind or "message",
+            "file": file,
+            "specifier": specifier,
+            "message": message
+        }
+        if fingerprint in self.baseline:
+            self.baselined_count += 1
+            return True
+        return False
+
+    def load_baseline(self, baseline_path: str):
+        """Load known finding fingerprints from a baseline file"""
+        path = Path(baseline_path)
+        if not path.exists():
+            self.log(f"Baseline {path} does not exist yet, reporting all findings")
+            return
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.baseline = {item["fingerprint"] for item in data.get("findings", [])}
+            self.log(f"Loaded {len(self.baseline)} baselined findings from {path}")
+        except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, AttributeError) as e:
+            self.log(f"Could not read baseline {path}: {e}", "ERROR")
+
+    def write_baseline(self, baseline_path: str) -> int:
+        """Write every finding seen in this run to a baseline file"""
+        findings = sorted(self.seen_findings.values(),
+                          key=lambda item: (item["file"] or "", item["kind"], item["specifier"] or ""))
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": 1, "findings": findings}, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        return len(findings)
+
+    def reset_results(self):
+        """Clear reported findings before re-running checks"""
+        self.errors = []
+        self.warnings = []
+        self.suggestions = []
+        self.baselined_count = 0
+        self.seen_findings = {}
+
     def add_suggestion(self, message: str):
         """Add suggestion to results"""
         self.suggestions.append(message)
@@ -102,27 +228,206 @@ class RefChecker:
 
     def find_js_files(self) -> List[Path]:
         """Find all JavaScript/TypeScript files in the project"""
-        js_files = []
+        if self.js_files_cache is not None:
+            return list(self.js_files_cache)
 
         # Focus on imports directory for Meteor projects
-        search_dirs = [
-            self.root_dir / "imports",
-            self.root_dir / "client",
-            self.root_dir / "server",
-            self.root_dir / "public"
-        ]
+        search_dirs = ["imports", "client", "server", "public"]
+
+        start = time.perf_counter()
+        js_files = self.list_files_from_git(search_dirs) if self.use_git else None
+        method = "git ls-files"
+        if js_files is None:
+            js_files, dirs_pruned = self.walk_js_files(search_dirs)
+            method = "scandir"
+        else:
+            dirs_pruned = self.walk_stats.get("dirs_pruned", 0)
+        elapsed = time.perf_counter() - start
+
+        js_files.sort()
+        self.js_files_cache = js_files
+        self.walk_stats = {
+            "method": method,
+            "files": len(js_files),
+            "dirs_pruned": dirs_pruned,
+            "seconds": elapsed
+        }
+
+        files_per_sec = len(js_files) / elapsed if elapsed > 0 else float(len(js_files))
+        self.log(f"Found {len(js_files)} JavaScript/TypeScript files via {method} "
+                 f"({files_per_sec:,.0f} files/sec, {dirs_pruned} directories pruned)")
+        return list(js_files)
 
-        for search_dir in search_dirs:
-            if search_dir.exists():
-                for file_path in search_dir.rglob("*"):
-                    if file_path.suffix in self.js_extensions and file_path.is_file():
-                        js_files.append(file_path)
+    def invalidate_file_cache(self):
+        """Forget the cached file list and resolutions after files are moved or created"""
+        self.js_files_cache = None
+        self.resolve_cache = {}
+        self.heavy_cache = {}
 
-        self.log(f"Found {len(js_files)} JavaScript/TypeScript files")
+    def list_files_from_git(self, search_dirs: List[str]) -> Optional[List[Path]]:
+        """List tracked and untracked-but-not-ignored source files with git, None outside a repo"""
+        try:
+            result = subprocess.run(
+                ['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard', '--'] + search_dirs,
+                cwd=self.root_dir, capture_output=True
+            )
+        except (OSError, ValueError):
+            return None
+        if result.returncode != 0:
+            return None
+
+        js_files = []
+        pruned = set()
+        for entry in result.stdout.decode('utf-8', errors='surrogateescape').split('\0'):
+            if not entry or os.path.splitext(entry)[1] not in self.js_extensions:
+                continue
+            parts = entry.split('/')
+            ignored = next((i for i, part in enumerate(parts[:-1]) if part in self.ignore_dirs), None)
+            if ignored is not None:
+                pruned.add('/'.join(parts[:ignored + 1]))
+                continue
+            file_path = self.root_dir / entry
+            # Deleted-but-still-tracked files are listed by --cached
+            if file_path.is_file():
+                js_files.append(file_path)
+
+        self.walk_stats["dirs_pruned"] = len(pruned)
         return js_files
 
-    def extract_imports(self, file_path: Path) -> List[Tuple[str, int]]:
-        """Extract import statements from a file"""
+    def walk_js_files(self, search_dirs: List[str]) -> Tuple[List[Path], int]:
+        """os.scandir walk that prunes ignored directories before descending"""
+        js_files = []
+        dirs_pruned = 0
+        base_rules = self.load_parent_gitignores()
+
+        pending = [(self.root_dir / d, base_rules) for d in search_dirs]
+        while pending:
+            directory, rules = pending.pop()
+            if not directory.is_dir():
+                continue
+            rules = rules + self.load_gitignore(directory)
+
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                self.log(f"Could not read directory {directory}: {e}")
+                continue
+
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+
+                if is_dir:
+                    if entry.name in self.ignore_dirs or self.is_gitignored(Path(entry.path), True, rules):
+                        dirs_pruned += 1
+                        continue
+                    pending.append((Path(entry.path), rules))
+                elif os.path.splitext(entry.name)[1] in self.js_extensions and entry.is_file():
+                    if not self.is_gitignored(Path(entry.path), False, rules):
+                        js_files.append(Path(entry.path))
+
+        return js_files, dirs_pruned
+
+    def load_parent_gitignores(self) -> List[Tuple[Path, re.Pattern, bool, bool, bool]]:
+        """Load .gitignore rules from the root directory up to the enclosing repository root"""
+        directories = []
+        current_dir = self.root_dir
+        while current_dir != current_dir.parent:
+            directories.append(current_dir)
+            if (current_dir / ".git").exists():
+                break
+            current_dir = current_dir.parent
+        else:
+            # Not inside a repository, only the root's own ignore file applies
+            directories = [self.root_dir]
+
+        rules = []
+        for directory in reversed(directories):
+            rules.extend(self.load_gitignore(directory))
+        return rules
+
+    def load_gitignore(self, directory: Path) -> List[Tuple[Path, re.Pattern, bool, bool, bool]]:
+        """Parse a directory's .gitignore into (base, pattern, negated, dir_only, anchored) rules"""
+        gitignore = directory / ".gitignore"
+        if not gitignore.is_file():
+            return []
+
+        rules = []
+        try:
+            with open(gitignore, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    pattern = line.rstrip('\n').rstrip()
+                    if not pattern or pattern.startswith('#'):
+                        continue
+                    negated = pattern.startswith('!')
+                    if negated:
+                        pattern = pattern[1:]
+                    dir_only = pattern.endswith('/')
+                    pattern = pattern.rstrip('/')
+                    anchored = '/' in pattern
+                    rules.append((directory, self.gitignore_regex(pattern.lstrip('/')), negated, dir_only, anchored))
+        except OSError as e:
+            self.log(f"Could not read {gitignore}: {e}")
+        return rules
+
+    def gitignore_regex(self, pattern: str) -> re.Pattern:
+        """Translate a gitignore glob: * and ? stop at /, **/ and /** span directories,
+        and a match also covers everything below it"""
+        parts = []
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith('**/', i):
+                parts.append('(?:.*/)?')
+                i += 3
+            elif pattern.startswith('**', i):
+                parts.append('.*')
+                i += 2
+            elif pattern[i] == '*':
+                parts.append('[^/]*')
+                i += 1
+            elif pattern[i] == '?':
+                parts.append('[^/]')
+                i += 1
+            elif pattern[i] == '[' and pattern.find(']', i + 2) != -1:
+                end = pattern.find(']', i + 2)
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append('[' + body + ']')
+                i = end + 1
+            elif pattern[i] == '\\' and i + 1 < len(pattern):
+                parts.append(re.escape(pattern[i + 1]))
+                i += 2
+            else:
+                parts.append(re.escape(pattern[i]))
+                i += 1
+        return re.compile(''.join(parts) + '(?:/.*)?')
+
+    def is_gitignored(self, path: Path, is_dir: bool, rules: List[Tuple[Path, re.Pattern, bool, bool, bool]]) -> bool:
+        """Apply gitignore rules in order, the last matching rule wins"""
+        ignored = False
+        for base, pattern, negated, dir_only, anchored in rules:
+            if dir_only and not is_dir:
+                continue
+            try:
+                relative = path.relative_to(base).as_posix()
+            except ValueError:
+                continue
+            target = relative if anchored else path.name
+            if pattern.fullmatch(target):
+                ignored = not negated
+        return ignored
+
+    def extract_imports(self, file_path: Path, include_dynamic: bool = True) -> List[Tuple[str, int]]:
+        """Extract import statements from a file (static-only when include_dynamic is False)"""
+        return [(import_path, line_num)
+                for import_path, line_num, dynamic in self.extract_import_records(file_path)
+                if include_dynamic or not dynamic]
+
+    def extract_import_records(self, file_path: Path) -> List[Tuple[str, int, bool]]:
+        """Extract (import path, line, is dynamic import()) records from a file"""
         imports = []
 
         try:
@@ -154,13 +459,14 @@ class RefChecker:
 
                 # Check for import patterns in this line
                 for pattern in self.import_patterns:
+                    dynamic = pattern not in self.static_import_patterns
                     matches = re.finditer(pattern, line)
                     for match in matches:
                         import_path = match.group(1)
-                        imports.append((import_path, line_num))
+                        imports.append((import_path, line_num, dynamic))
 
         except Exception as e:
-            self.add_error(f"Error reading {file_path}: {e}")
+            self.add_error(f"Error reading {file_path}: {e}", "read-error", self.relative_path_str(file_path))
 
         return imports
 
@@ -196,7 +502,7 @@ class RefChecker:
                     named_imports.append((import_names, source_path, line_num))
 
         except Exception as e:
-            self.add_error(f"Error reading {file_path}: {e}")
+            self.add_error(f"Error reading {file_path}: {e}", "read-error", self.relative_path_str(file_path))
 
         return named_imports
 
@@ -264,7 +570,7 @@ class RefChecker:
             # (The patterns above should catch all legitimate exports)
 
         except Exception as e:
-            self.add_error(f"Error reading exports from {file_path}: {e}")
+            self.add_error(f"Error reading exports from {file_path}: {e}", "read-error", self.relative_path_str(file_path))
 
         return exports
 
@@ -333,6 +639,13 @@ class RefChecker:
         return dependencies
 
     def resolve_import_path(self, import_path: str, current_file: Path) -> Optional[Path]:
+        """Resolve an import path to an actual file path (memoized per directory and specifier)"""
+        cache_key = (str(current_file.parent), import_path)
+        if cache_key not in self.resolve_cache:
+            self.resolve_cache[cache_key] = self.resolve_import_path_uncached(import_path, current_file)
+        return self.resolve_cache[cache_key]
+
+    def resolve_import_path_uncached(self, import_path: str, current_file: Path) -> Optional[Path]:
         """Resolve an import path to an actual file path"""
         # Handle relative imports (starting with . or ..)
         if import_path.startswith('.'):
@@ -393,32 +706,52 @@ class RefChecker:
 
         for file_path in js_files:
             relative_path = file_path.relative_to(self.root_dir)
-            imports = self.extract_imports(file_path)
+            for error_msg, kind, specifier in self.find_broken_imports(file_path):
+                broken_imports[str(relative_path)].append(error_msg)
+                self.add_error(error_msg, kind, str(relative_path), specifier)
 
-            for import_path, line_num in imports:
-                resolved = self.resolve_import_path(import_path, file_path)
+        return dict(broken_imports)
 
-                if resolved is None and not self.is_external_package(import_path):
-                    error_msg = f"{relative_path}:{line_num} - Broken import: '{import_path}'"
-                    broken_imports[str(relative_path)].append(error_msg)
-                    self.add_error(error_msg)
+    def find_broken_imports(self, file_path: Path) -> List[Tuple[str, str, str]]:
+        """Find broken imports in one file as (message, kind, specifier) tuples"""
+        relative_path = file_path.relative_to(self.root_dir)
+        broken = []
 
-            # Check named imports
-            named_imports = self.extract_named_imports(file_path)
-            for import_names, source_path, line_num in named_imports:
-                resolved = self.resolve_import_path(source_path, file_path)
+        for import_path, line_num in self.extract_imports(file_path):
+            resolved = self.resolve_import_path(import_path, file_path)
 
-                if resolved and not self.is_external_package(source_path):
-                    # File exists, check if exports contain the named imports
-                    exports = self.extract_exports(resolved)
+            if resolved is None and not self.is_external_package(import_path):
+                error_msg = f"{relative_path}:{line_num} - Broken import: '{import_path}'"
+                broken.append((error_msg, "broken-import", import_path))
 
-                    for import_name in import_names:
-                        if import_name not in exports:
-                            error_msg = f"{relative_path}:{line_num} - Named import '{import_name}' not found in '{source_path}'"
-                            broken_imports[str(relative_path)].append(error_msg)
-                            self.add_error(error_msg)
+        # Check named imports
+        named_imports = self.extract_named_imports(file_path)
+        for import_names, source_path, line_num in named_imports:
+            resolved = self.resolve_import_path(source_path, file_path)
 
-        return dict(broken_imports)
+            if resolved and not self.is_external_package(source_path):
+                # File exists, check if exports contain the named imports
+                exports = self.get_exports(resolved)
+
+                for import_name in import_names:
+                    if import_name not in exports:
+                        error_msg = f"{relative_path}:{line_num} - Named import '{import_name}' not found in '{source_path}'"
+                        broken.append((error_msg, "missing-named-import", f"{source_path}#{import_name}"))
+
+        return broken
+
+    def get_exports(self, file_path: Path) -> Set[str]:
+        """extract_exports memoized on the file's mtime"""
+        try:
+            mtime_ns = file_path.stat().st_mtime_ns
+        except OSError:
+            return set()
+        cached = self.exports_cache.get(str(file_path))
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        exports = self.extract_exports(file_path)
+        self.exports_cache[str(file_path)] = (mtime_ns, exports)
+        return exports
 
     def is_external_package(self, import_path: str) -> bool:
         """Check if import is an external package that exists in package.json or is built-in"""
@@ -447,22 +780,367 @@ class RefChecker:
 
 
 
+    def default_index_path(self) -> Optional[Path]:
+        """Keep the import index in Meteor's (gitignored) local build directory when there is one"""
+        meteor_dir = self.root_dir / ".meteor"
+        if meteor_dir.is_dir():
+            return meteor_dir / "local" / "checkrefs-index.json"
+        return None
+
+    def import_patterns_digest(self) -> str:
+        """Digest of the import patterns the index was built with"""
+        return hashlib.sha1("\n".join(self.import_patterns).encode('utf-8')).hexdigest()[:16]
+
+    def load_import_index(self) -> Dict[str, Dict]:
+        """Load the persisted per-file import records, refreshing files whose mtime or size changed"""
+        if self.import_index is not None:
+            return self.import_index
+
+        cached_files = {}
+        if self.index_path and self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                # Records parsed with different import patterns are not reusable
+                if data.get("version") == 1 and data.get("patterns") == self.import_patterns_digest():
+                    cached_files = data.get("files", {})
+            except (json.JSONDecodeError, UnicodeDecodeError, OSError, AttributeError) as e:
+                self.log(f"Ignoring unreadable import index {self.index_path}: {e}")
+
+        index = {}
+        reparsed = 0
+        for file_path in self.find_js_files():
+            relative_path = file_path.relative_to(self.root_dir).as_posix()
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+
+            entry = cached_files.get(relative_path)
+            if not entry or entry.get("mtime_ns") != stat.st_mtime_ns or entry.get("size") != stat.st_size:
+                entry = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "imports": [list(record) for record in self.extract_import_records(file_path)]
+                }
+                reparsed += 1
+            index[relative_path] = entry
+
+        self.import_index = index
+        self.import_index_dirty = reparsed > 0 or len(index) != len(cached_files)
+        self.log(f"Import index: {len(index) - reparsed} cached, {reparsed} parsed")
+        return index
+
+    def refresh_import_index(self, rescan: bool = False) -> bool:
+        """Re-parse indexed files whose mtime or size changed; rescan also picks up added/removed files"""
+        if self.import_index is None:
+            self.load_import_index()
+            return True
+
+        if rescan:
+            self.js_files_cache = None
+            paths = {f.relative_to(self.root_dir).as_posix() for f in self.find_js_files()}
+        else:
+            paths = set(self.import_index)
+
+        changed = False
+        files_changed = paths != set(self.import_index)
+        for relative_path in paths:
+            file_path = self.root_dir / relative_path
+            try:
+                stat = file_path.stat()
+            except OSError:
+                self.import_index.pop(relative_path, None)
+                changed = files_changed = True
+                continue
+            entry = self.import_index.get(relative_path)
+            if not entry or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                self.import_index[relative_path] = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "imports": [list(record) for record in self.extract_import_records(file_path)]
+                }
+                changed = True
+
+        for relative_path in set(self.import_index) - paths:
+            del self.import_index[relative_path]
+            changed = True
+
+        # Resolution depends on which files exist, not on their contents
+        if files_changed:
+            self.resolve_cache = {}
+        if changed:
+            self.import_index_dirty = True
+        return changed
+
+    def save_import_index(self):
+        """Persist the import index if it changed during this run"""
+        if not self.index_path or self.import_index is None or not self.import_index_dirty:
+            return
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_path.with_suffix(".tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": 1, "patterns": self.import_patterns_digest(), "files": self.import_index},
+                          f, separators=(',', ':'))
+            os.replace(temp_path, self.index_path)
+            self.import_index_dirty = False
+        except OSError as e:
+            self.log(f"Could not write import index {self.index_path}: {e}")
+
+    def iter_resolved_imports(self, eager_only: bool = False):
+        """Yield (importer, import path, line, resolved target) over the import index (root-relative)"""
+        for relative_path, entry in self.load_import_index().items():
+            file_path = self.root_dir / relative_path
+            for import_path, line_num, dynamic in entry["imports"]:
+                if eager_only and dynamic:
+                    continue
+                resolved = self.resolve_import_path(import_path, file_path)
+                if resolved is None:
+                    continue
+                try:
+                    target = resolved.relative_to(self.root_dir).as_posix()
+                except ValueError:
+                    continue  # Outside the checked tree
+                yield relative_path, import_path, line_num, target
+
+    def build_dependency_graph(self, eager_only: bool = False) -> Dict[str, Set[str]]:
+        """Build the file -> imported files graph (root-relative paths)"""
+        dependency_graph = defaultdict(set)
+        for importer, _, _, target in self.iter_resolved_imports(eager_only):
+            dependency_graph[importer].add(target)
+        return dependency_graph
+
+    def build_reverse_index(self) -> Dict[str, List[Tuple[str, str, int]]]:
+        """Map each file to the (importer, import path, line) records that resolve to it"""
+        reverse_index = defaultdict(list)
+        for importer, import_path, line_num, target in self.iter_resolved_imports():
+            reverse_index[target].append((importer, import_path, line_num))
+        return reverse_index
+
+    def find_strongly_connected_components(self, graph: Dict[str, Set[str]]) -> List[List[str]]:
+        """Tarjan's algorithm (iterative), components returned in reverse topological order"""
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+
+        nodes = set(graph)
+        for targets in graph.values():
+            nodes.update(targets)
+
+        for root in sorted(nodes):
+            if root in index:
+                continue
+
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(sorted(graph.get(root, ()))))]
+
+            while work:
+                node, neighbors = work[-1]
+                advanced = False
+                for neighbor in neighbors:
+                    if neighbor not in index:
+                        index[neighbor] = lowlink[neighbor] = counter
+                        counter += 1
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(sorted(graph.get(neighbor, ())))))
+                        advanced = True
+                        break
+                    elif neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[neighbor])
+
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+
+        return components
+
+    def find_entry_points(self) -> List[str]:
+        """Find the modules Meteor evaluates eagerly at startup"""
+        # An explicit meteor.mainModule in package.json replaces eager loading
+        package_json = self.root_dir / "package.json"
+        if package_json.exists():
+            try:
+                with open(package_json, 'r', encoding='utf-8') as f:
+                    main_module = json.load(f).get("meteor", {}).get("mainModule")
+                if isinstance(main_module, str):
+                    main_module = {"main": main_module}
+                if isinstance(main_module, dict):
+                    entries = [m[2:] if m.startswith('./') else m for m in main_module.values() if isinstance(m, str)]
+                    entries = [e for e in entries if (self.root_dir / e).is_file()]
+                    if entries:
+                        return sorted(entries)
+            except (json.JSONDecodeError, UnicodeDecodeError, AttributeError) as e:
+                self.log(f"Warning: Could not read meteor.mainModule from {package_json}: {e}")
+
+        # Otherwise every file under client/ and server/ is loaded eagerly
+        entries = []
+        for file_path in self.find_js_files():
+            relative_path = file_path.relative_to(self.root_dir)
+            if relative_path.parts[0] in ("client", "server"):
+                entries.append(relative_path.as_posix())
+        return sorted(entries)
+
+    def analyze_critical_path(self, top_n: int = 10) -> Dict:
+        """Report the longest eager import chains and highest transitive fan-in modules"""
+        self.log("Analyzing module-evaluation critical path...")
+
+        graph = self.build_dependency_graph(eager_only=True)
+        components = self.find_strongly_connected_components(graph)
+
+        # Condense cycles so longest-path and reachability run on a DAG
+        component_of = {}
+        for component_id, component in enumerate(components):
+            for module in component:
+                component_of[module] = component_id
+
+        condensed = defaultdict(set)
+        for source, targets in graph.items():
+            for target in targets:
+                if component_of[source] != component_of[target]:
+                    condensed[component_of[source]].add(component_of[target])
+
+        # Tarjan yields sinks first, so reversing gives a topological order
+        topo_order = list(range(len(components) - 1, -1, -1))
+
+        # Transitive fan-in: bitset of ancestor modules, built in topological order
+        module_bits = [0] * len(components)
+        bit = 0
+        for component_id, component in enumerate(components):
+            for _ in component:
+                module_bits[component_id] |= 1 << bit
+                bit += 1
+
+        ancestors = [0] * len(components)
+        for component_id in topo_order:
+            reach = ancestors[component_id] | module_bits[component_id]
+            for target in condensed[component_id]:
+                ancestors[target] |= reach
+
+        fan_in = []
+        for component_id, component in enumerate(components):
+            importers = bin(ancestors[component_id]).count('1')
+            # Other members of an import cycle also (transitively) import each module
+            importers += len(component) - 1
+            for module in component:
+                fan_in.append((importers, module))
+        fan_in.sort(key=lambda item: (-item[0], item[1]))
+
+        entry_reports = []
+        all_chains = []
+        for entry in self.find_entry_points():
+            if entry not in component_of:
+                entry_reports.append({"entry": entry, "eager_modules": 1, "depth": 1, "longest_chain": [entry]})
+                continue
+
+            # Longest path (in modules) from the entry over the condensed DAG
+            start = component_of[entry]
+            depth = {start: len(components[start])}
+            previous = {start: None}
+            reachable = set()
+            pending = [start]
+            while pending:
+                component_id = pending.pop()
+                if component_id in reachable:
+                    continue
+                reachable.add(component_id)
+                pending.extend(condensed[component_id])
+
+            for component_id in topo_order:
+                if component_id not in depth:
+                    continue
+                for target in condensed[component_id]:
+                    candidate = depth[component_id] + len(components[target])
+                    if candidate > depth.get(target, 0):
+                        depth[target] = candidate
+                        previous[target] = component_id
+
+            def chain_to(component_id):
+                chain = []
+                while component_id is not None:
+                    members = components[component_id]
+                    label = members[0] if len(members) == 1 else f"{members[0]} (+{len(members) - 1} in cycle)"
+                    chain.append(label)
+                    component_id = previous[component_id]
+                chain.reverse()
+                chain[0] = entry
+                return chain
+
+            sinks = [c for c in reachable if not condensed[c]]
+            deepest = max(sinks, key=lambda c: (depth[c], -c))
+            eager_modules = sum(len(components[c]) for c in reachable)
+
+            entry_reports.append({
+                "entry": entry,
+                "eager_modules": eager_modules,
+                "depth": depth[deepest],
+                "longest_chain": chain_to(deepest)
+            })
+            for sink in sinks:
+                all_chains.append((depth[sink], entry, chain_to(sink)))
+
+        all_chains.sort(key=lambda item: (-item[0], item[1], item[2]))
+
+        return {
+            "entry_points": entry_reports,
+            "deepest_chains": [
+                {"entry": entry, "depth": depth_value, "chain": chain}
+                for depth_value, entry, chain in all_chains[:top_n]
+            ],
+            "highest_fan_in": [
+                {"module": module, "transitive_importers": importers}
+                for importers, module in fan_in[:top_n]
+            ]
+        }
+
+    def print_critical_path_report(self, report: Dict):
+        """Print the critical path analysis as rich tables"""
+        table = Table(title="🚀 Eager Startup Modules per Entry Point", show_header=True, header_style="bold magenta")
+        table.add_column("Entry Point", style="cyan")
+        table.add_column("Eager Modules", justify="center")
+        table.add_column("Longest Chain", justify="center")
+        for entry in report["entry_points"]:
+            table.add_row(entry["entry"], str(entry["eager_modules"]), str(entry["depth"]))
+        console.print(table)
+
+        console.print("\n[bold]🔗 Deepest import chains[/bold]")
+        for item in report["deepest_chains"]:
+            console.print(f"[yellow]{item['depth']}[/yellow] [dim]{item['entry']}[/dim]")
+            console.print("    " + " → ".join(item["chain"][1:]))
+
+        table = Table(title="🎯 Highest Transitive Fan-In", show_header=True, header_style="bold magenta")
+        table.add_column("Module", style="cyan")
+        table.add_column("Importers", justify="center")
+        for item in report["highest_fan_in"]:
+            table.add_row(item["module"], str(item["transitive_importers"]))
+        console.print(table)
+
     def check_circular_dependencies(self) -> List[List[str]]:
         """Check for circular dependencies"""
         self.log("Checking for circular dependencies...")
 
-        # Build dependency graph
-        dependency_graph = defaultdict(set)
-        js_files = self.find_js_files()
-
-        for file_path in js_files:
-            imports = self.extract_imports(file_path)
-            for import_path, _ in imports:
-                resolved = self.resolve_import_path(import_path, file_path)
-                if resolved:
-                    dependency_graph[str(file_path.relative_to(self.root_dir))].add(
-                        str(resolved.relative_to(self.root_dir))
-                    )
+        dependency_graph = self.build_dependency_graph()
 
         # Find cycles using DFS
         cycles = []
@@ -490,21 +1168,1083 @@ class RefChecker:
             visited.add(node)
             rec_stack.add(node)
 
-            for neighbor in dependency_graph.get(node, []):
+            # Sorted traversal keeps the reported cycles stable between runs
+            for neighbor in sorted(dependency_graph.get(node, [])):
                 dfs(neighbor, path + [node])
 
             rec_stack.remove(node)
 
-        for node in dependency_graph:
+        for node in sorted(dependency_graph):
             if node not in visited:
                 dfs(node, [])
 
         for cycle in cycles:
             cycle_str = " → ".join(cycle)
-            self.add_warning(f"Circular dependency: {cycle_str}")
+            # Rotate to the smallest module so the fingerprint does not depend on where DFS entered
+            members = cycle[:-1] or cycle
+            start = members.index(min(members))
+            canonical = " → ".join(members[start:] + members[:start])
+            self.add_warning(f"Circular dependency: {cycle_str}", "circular-dependency", min(members), canonical)
+
+        if cycles:
+            for edge in self.suggest_cycle_breaks(dependency_graph):
+                location = f"{edge['source']}:{edge['line']}" if edge['line'] else edge['source']
+                cycle_count = f"{edge['cycles']}+" if edge['capped'] else str(edge['cycles'])
+                self.add_suggestion(f"[CYCLE BREAK] Remove import '{edge['specifier']}' in {location} "
+                                    f"(→ {edge['target']}, on {cycle_count} cycles)")
 
         return cycles
 
+    def suggest_cycle_breaks(self, dependency_graph: Dict[str, Set[str]],
+                             max_cycles: int = 100, max_steps: int = 5000) -> List[Dict]:
+        """Heuristic minimum feedback arc set: import edges whose removal makes the graph acyclic"""
+        feedback_edges = []
+
+        for component in self.find_strongly_connected_components(dependency_graph):
+            members = set(component)
+            if len(members) == 1:
+                node = component[0]
+                if node in dependency_graph.get(node, ()):
+                    feedback_edges.append((node, node, None))
+                continue
+
+            successors = {node: {t for t in dependency_graph.get(node, ()) if t in members and t != node}
+                          for node in component}
+            for node in component:
+                if node in dependency_graph.get(node, ()):
+                    feedback_edges.append((node, node, None))
+
+            ordered_successors = {node: sorted(targets) for node, targets in successors.items()}
+            order = self._eades_ordering(successors)
+            position = {node: i for i, node in enumerate(order)}
+            backward = [(u, v) for u in component for v in successors[u] if position[u] > position[v]]
+
+            # Drop edges the ordering flagged needlessly: keep an edge if the rest stays acyclic
+            kept = {u: set(vs) for u, vs in successors.items()}
+            for u, v in backward:
+                kept[u].discard(v)
+            for u, v in sorted(backward, key=lambda edge: position[edge[0]] - position[edge[1]]):
+                if not self._has_path(kept, v, u):
+                    kept[u].add(v)
+                else:
+                    feedback_edges.append((u, v, ordered_successors))
+
+        suggestions = []
+        for source, target, ordered_successors in feedback_edges:
+            cycles, capped = self._count_cycles_through(ordered_successors, source, target, max_cycles, max_steps)
+            specifier, line = self._find_import_site(source, target)
+            suggestions.append({
+                "source": source,
+                "target": target,
+                "specifier": specifier,
+                "line": line,
+                "cycles": cycles,
+                "capped": capped
+            })
+
+        suggestions.sort(key=lambda edge: (-edge["cycles"], edge["source"], edge["target"]))
+        return suggestions
+
+    def _eades_ordering(self, successors: Dict[str, Set[str]]) -> List[str]:
+        """Eades-Lin-Smyth greedy vertex ordering; edges pointing backwards form a feedback arc set"""
+        predecessors = defaultdict(set)
+        for u, vs in successors.items():
+            for v in vs:
+                predecessors[v].add(u)
+
+        out_degree = {node: len(vs) for node, vs in successors.items()}
+        in_degree = {node: len(predecessors[node]) for node in successors}
+        remaining = set(successors)
+        left, right = [], []
+
+        # Max-heap on out-in degree with lazy invalidation keeps each pick O(log n)
+        heap = [(in_degree[n] - out_degree[n], n) for n in successors]
+        heapq.heapify(heap)
+        sinks = deque(n for n in successors if out_degree[n] == 0)
+        sources = deque(n for n in successors if in_degree[n] == 0 and out_degree[n] > 0)
+
+        def remove(node):
+            remaining.discard(node)
+            for v in successors[node]:
+                if v in remaining:
+                    in_degree[v] -= 1
+                    if in_degree[v] == 0:
+                        sources.append(v)
+                    heapq.heappush(heap, (in_degree[v] - out_degree[v], v))
+            for u in predecessors[node]:
+                if u in remaining:
+                    out_degree[u] -= 1
+                    if out_degree[u] == 0:
+                        sinks.append(u)
+                    heapq.heappush(heap, (in_degree[u] - out_degree[u], u))
+
+        while remaining:
+            if sinks:
+                node = sinks.popleft()
+                if node in remaining:
+                    right.append(node)
+                    remove(node)
+                continue
+            if sources:
+                node = sources.popleft()
+                if node in remaining:
+                    left.append(node)
+                    remove(node)
+                continue
+
+            delta, node = heapq.heappop(heap)
+            if node not in remaining or delta != in_degree[node] - out_degree[node]:
+                continue
+            left.append(node)
+            remove(node)
+
+        return left + right[::-1]
+
+    def _has_path(self, graph: Dict[str, Set[str]], start: str, goal: str) -> bool:
+        """Check whether goal is reachable from start"""
+        seen = {start}
+        pending = [start]
+        while pending:
+            node = pending.pop()
+            if node == goal:
+                return True
+            for neighbor in graph.get(node, ()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    pending.append(neighbor)
+        return False
+
+    def _count_cycles_through(self, successors: Optional[Dict[str, List[str]]], source: str, target: str,
+                              max_cycles: int, max_steps: int) -> Tuple[int, bool]:
+        """Count simple cycles using edge source → target (bounded), returns (count, capped)"""
+        if source == target:
+            return 1, False
+
+        count = 0
+        steps = 0
+        on_path = {target}
+        stack = [(target, iter(successors[target]))]
+        while stack:
+            node, neighbors = stack[-1]
+            advanced = False
+            for neighbor in neighbors:
+                steps += 1
+                if steps > max_steps or count >= max_cycles:
+                    return count, True
+                if neighbor == source:
+                    count += 1
+                elif neighbor not in on_path:
+                    on_path.add(neighbor)
+                    stack.append((neighbor, iter(successors[neighbor])))
+                    advanced = True
+                    break
+            if not advanced:
+                stack.pop()
+                on_path.discard(node)
+
+        return count, False
+
+    def _find_import_site(self, source: str, target: str) -> Tuple[str, Optional[int]]:
+        """Find the import specifier and line in source that resolves to target"""
+        source_path = self.root_dir / source
+        for import_path, line_num in self.extract_imports(source_path):
+            resolved = self.resolve_import_path(import_path, source_path)
+            if resolved and resolved.relative_to(self.root_dir).as_posix() == target:
+                return import_path, line_num
+        return target, None
+
+    def read_source(self, file_path: Path) -> Tuple[str, str]:
+        """Return (content, masked content) for a file, memoized on its mtime"""
+        mtime_ns = file_path.stat().st_mtime_ns
+        cached = self.source_cache.get(str(file_path))
+        if cached and cached[0] == mtime_ns:
+            return cached[1], cached[2]
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        masked = self.mask_js_source(content)
+        self.source_cache[str(file_path)] = (mtime_ns, content, masked)
+        return content, masked
+
+    def mask_js_source(self, content: str) -> str:
+        """Blank out comments and string/regex literal contents, keeping offsets and newlines intact"""
+        out = list(content)
+        length = len(content)
+        i = 0
+        last_significant = ''
+
+        def blank(start, end):
+            for j in range(start, end):
+                if out[j] != '\n':
+                    out[j] = ' '
+
+        while i < length:
+            char = content[i]
+            next_char = content[i + 1] if i + 1 < length else ''
+
+            if char == '/' and next_char == '/':
+                end = content.find('\n', i)
+                end = length if end == -1 else end
+                blank(i, end)
+                i = end
+                continue
+            if char == '/' and next_char == '*':
+                end = content.find('*/', i + 2)
+                end = length if end == -1 else end + 2
+                blank(i, end)
+                i = end
+                continue
+            if char in ('"', "'", '`') or (char == '/' and last_significant in ('', '(', ',', '=', ':', '[', '!', '&', '|', '?', '{', '}', ';', '+', '-', '*', '%', '<', '>', '~', '^')):
+                # Strings keep their quotes so callers can still see that a literal was there
+                j = i + 1
+                in_class = False
+                while j < length:
+                    current = content[j]
+                    if current == '\\':
+                        j += 2
+                        continue
+                    if char == '/':
+                        if current == '[':
+                            in_class = True
+                        elif current == ']':
+                            in_class = False
+                        elif current == '/' and not in_class:
+                            break
+                        elif current == '\n':
+                            break
+                    elif current == char or (current == '\n' and char != '`'):
+                        break
+                    j += 1
+                blank(i + 1, min(j, length))
+                i = j + 1
+                last_significant = 'a'
+                continue
+
+            if not char.isspace():
+                last_significant = char if not (char.isalnum() or char in '_$') else 'a'
+                # Keywords after which a slash starts a regex literal
+                if last_significant == 'a' and content.startswith('return', i) and not content[i + 6:i + 7].isalnum():
+                    i += 6
+                    last_significant = '('
+                    continue
+            i += 1
+
+        return ''.join(out)
+
+    def find_closing_bracket(self, masked: str, open_index: int) -> int:
+        """Index of the bracket closing the one at open_index, -1 if unbalanced"""
+        pairs = {'(': ')', '[': ']', '{': '}'}
+        stack = []
+        for i in range(open_index, len(masked)):
+            char = masked[i]
+            if char in pairs:
+                stack.append(pairs[char])
+            elif char in (')', ']', '}'):
+                if not stack or stack.pop() != char:
+                    return -1
+                if not stack:
+                    return i
+        return -1
+
+    def split_call_arguments(self, masked: str, open_index: int, close_index: int) -> List[Tuple[int, int]]:
+        """Split the arguments between a call's parentheses into trimmed (start, end) spans"""
+        spans = []
+        depth = 0
+        start = open_index + 1
+        for i in range(open_index + 1, close_index):
+            char = masked[i]
+            if char in '([{':
+                depth += 1
+            elif char in ')]}':
+                depth -= 1
+            elif char == ',' and depth == 0:
+                spans.append((start, i))
+                start = i + 1
+        spans.append((start, close_index))
+
+        trimmed = []
+        for span_start, span_end in spans:
+            while span_start < span_end and masked[span_start].isspace():
+                span_start += 1
+            while span_end > span_start and masked[span_end - 1].isspace():
+                span_end -= 1
+            if span_end > span_start:
+                trimmed.append((span_start, span_end))
+        return trimmed
+
+    def iter_calls(self, masked: str, callee_pattern: str, start: int = 0, end: Optional[int] = None):
+        """Yield (match, open paren index, close paren index) for calls whose callee matches"""
+        end = len(masked) if end is None else end
+        for match in re.finditer(callee_pattern + r'\s*\(', masked[:end]):
+            if match.start() < start:
+                continue
+            open_index = match.end() - 1
+            close_index = self.find_closing_bracket(masked, open_index)
+            if close_index != -1:
+                yield match, open_index, close_index
+
+    def line_starts(self, content: str) -> List[int]:
+        """Offsets at which each line starts, for offset → line lookups with bisect"""
+        starts = [0]
+        starts.extend(m.end() for m in re.finditer('\n', content))
+        return starts
+
+    def offset_to_line(self, starts: List[int], offset: int) -> int:
+        return bisect.bisect_right(starts, offset)
+
+    def find_server_files(self, marker: str) -> List[Path]:
+        """JavaScript files outside the client tree whose source mentions marker"""
+        files = []
+        for file_path in self.find_js_files():
+            parts = file_path.relative_to(self.root_dir).parts
+            if parts[0] in ("client", "public") or "ui" in parts[:2] or "client" in parts[:3]:
+                continue
+            try:
+                content, _ = self.read_source(file_path)
+            except (OSError, UnicodeDecodeError) as e:
+                self.log(f"Error reading {file_path}: {e}", "ERROR")
+                continue
+            if marker in content:
+                files.append(file_path)
+        return files
+
+    def check_publications(self) -> List[Dict]:
+        """Lint Meteor.publish bodies for cursors that publish too much data"""
+        self.log("Checking Meteor publications for performance hazards...")
+        findings = []
+        collection_find = r'((?:[A-Za-z_$][\w$]*\.)*[A-Za-z_$][\w$]*)\s*\.\s*find'
+        consumed = re.compile(r'\s*\.\s*(?:fetch|count|forEach|map|observe|observeChanges)(?:Async)?\b')
+
+        for file_path in self.find_server_files("Meteor.publish"):
+            relative_path = file_path.relative_to(self.root_dir).as_posix()
+            content, masked = self.read_source(file_path)
+            starts = self.line_starts(content)
+
+            for _, open_index, close_index in self.iter_calls(masked, r'\bMeteor\s*\.\s*publish'):
+                arguments = self.split_call_arguments(masked, open_index, close_index)
+                if not arguments:
+                    continue
+                name_start, name_end = arguments[0]
+                publication = content[name_start:name_end].strip('"\'`')
+
+                for match, find_open, find_close in self.iter_calls(masked, collection_find, open_index, close_index):
+                    # Cursors that are fetched, counted or observed inside the body are not published
+                    if consumed.match(masked, find_close + 1):
+                        continue
+
+                    collection = re.sub(r'\s+', '', match.group(1))
+                    find_arguments = self.split_call_arguments(masked, find_open, find_close)
+                    selector = content[find_arguments[0][0]:find_arguments[0][1]] if find_arguments else ""
+                    options = content[find_arguments[1][0]:find_arguments[1][1]] if len(find_arguments) > 1 else ""
+                    line_num = self.offset_to_line(starts, match.start())
+
+                    for rule, message in self.publication_hazards(collection, selector, options):
+                        findings.append({"file": relative_path, "line": line_num, "publication": publication,
+                                         "collection": collection, "rule": rule})
+                        self.add_warning(f"{relative_path}:{line_num} - Publication '{publication}': {message}",
+                                         f"publication-{rule}", relative_path, f"{publication}#{collection}")
+
+        return findings
+
+    def publication_hazards(self, collection: str, selector: str, options: str) -> List[Tuple[str, str]]:
+        """Rules for one published cursor, returns (rule, message) pairs"""
+        hazards = []
+        # Options passed as a variable or spread cannot be judged statically
+        options_known = not options or options.lstrip().startswith('{') and '...' not in options
+        if not options_known:
+            return hazards
+
+        has_fields = re.search(r'["\']?\b(?:fields|projection)["\']?\s*:', options) is not None
+        has_limit = re.search(r'["\']?\blimit["\']?\s*:', options) is not None
+        is_users = collection == "Meteor.users"
+
+        if not has_fields:
+            if is_users:
+                hazards.append(("users-documents",
+                                "Meteor.users.find() without a fields projection publishes whole user documents"))
+            else:
+                hazards.append(("no-fields", f"{collection}.find() has no fields projection"))
+
+        if not has_limit and not self.is_single_document_selector(selector):
+            if self.is_constant_selector(selector):
+                hazards.append(("unbounded",
+                                f"{collection}.find({selector or ''}) publishes the same unbounded result set to every client"))
+            else:
+                hazards.append(("no-limit", f"{collection}.find() has no limit"))
+
+        return hazards
+
+    def is_single_document_selector(self, selector: str) -> bool:
+        """Selectors that match at most one document: an id value or {_id: value} without operators"""
+        selector = selector.strip()
+        if not selector:
+            return False
+        if not selector.startswith('{'):
+            # find(id) / find(this.userId)
+            return re.fullmatch(r'[\w$.]+|["\'][^"\']*["\']', selector) is not None
+        return re.search(r'["\']?\b_id["\']?\s*:\s*(?!\{)', selector) is not None
+
+    def is_constant_selector(self, selector: str) -> bool:
+        """True when the selector does not depend on the client (no variables, only literals)"""
+        masked = self.mask_js_source(selector)
+        masked = re.sub(r'["\'`]\s*["\'`]', ' ', masked)                    # string literals
+        masked = re.sub(r'[\w$]+\s*:', ' ', masked)                           # object keys
+        masked = re.sub(r'\b(?:true|false|null|undefined|\d+(?:\.\d+)?)\b', ' ', masked)
+        return re.search(r'[A-Za-z_$]', masked) is None
+
+    def object_entries(self, content: str, masked: str, start: int, end: int) -> Optional[List[Tuple[str, int, int]]]:
+        """Top-level (key, value start, value end) entries of an object literal span, None if not a literal"""
+        while start < end and masked[start].isspace():
+            start += 1
+        if start >= end or masked[start] != '{':
+            return None
+        close_index = self.find_closing_bracket(masked, start)
+        if close_index == -1 or close_index >= end:
+            return None
+
+        entries = []
+        for entry_start, entry_end in self.split_call_arguments(masked, start, close_index):
+            entry = masked[entry_start:entry_end]
+            if entry.startswith('...'):
+                continue
+            key_match = re.match(r'(["\'])(.*?)\1\s*:|([\w$]+)\s*:|([\w$]+)$', entry)
+            if not key_match:
+                continue  # Computed keys and methods
+            if key_match.group(1):
+                # Quoted key: the contents are masked, read them from the original
+                key = content[entry_start + 1:entry_start + 1 + len(key_match.group(2))]
+            else:
+                key = key_match.group(3) or key_match.group(4)
+            value_start = entry_start + key_match.end() if not key_match.group(4) else entry_start
+            entries.append((key, value_start, entry_end))
+        return entries
+
+    def find_collection_names(self) -> Dict[str, str]:
+        """Map collection variables to collection names from new Mongo.Collection(...) declarations"""
+        collections = {"Meteor.users": "users"}
+        declaration = re.compile(r'(?:const|let|var|export\s+const)\s+([\w$]+)\s*=\s*(?:[^;]*?\?\s*)?new\s+Mongo\s*\.\s*Collection\s*\(\s*["\']([^"\']+)["\']')
+        for file_path in self.find_js_files():
+            try:
+                content, _ = self.read_source(file_path)
+            except (OSError, UnicodeDecodeError):
+                continue
+            if "Mongo.Collection" not in content:
+                continue
+            for match in declaration.finditer(content):
+                collections[match.group(1)] = match.group(2)
+        return collections
+
+    def selector_shapes(self, content: str, masked: str, start: int, end: int) -> Optional[List[Set[str]]]:
+        """Field sets a selector filters on (one per $or branch), None when it cannot be read statically"""
+        text = masked[start:end].strip()
+        if not text.startswith('{'):
+            # find(id) / findOne(this.userId) / findOne(doc._id) / findOne("literal") are _id lookups,
+            # any other variable holds a selector that cannot be read statically
+            if re.fullmatch(r'(?:[\w$]+\s*\.\s*)*(?:id|_id|[\w$]*Id)|["\'`]\s*["\'`]', text):
+                return [{"_id"}]
+            return None
+
+        entries = self.object_entries(content, masked, start, end)
+        if entries is None:
+            return None
+
+        base = set()
+        branches = [set()]
+        for key, value_start, value_end in entries:
+            if key in ("$or", "$and"):
+                sub_shapes = []
+                value = masked[value_start:value_end].strip()
+                offset = masked.index(value[0], value_start) if value else value_start
+                if value.startswith('['):
+                    close_index = self.find_closing_bracket(masked, offset)
+                    for item_start, item_end in self.split_call_arguments(masked, offset, close_index):
+                        shapes = self.selector_shapes(content, masked, item_start, item_end)
+                        if shapes:
+                            sub_shapes.extend(shapes)
+                if key == "$and":
+                    for shape in sub_shapes:
+                        base |= shape
+                elif sub_shapes:
+                    branches = [branch | shape for branch in branches for shape in sub_shapes]
+            elif not key.startswith('$'):
+                base.add(key)
+
+        return [branch | base for branch in branches]
+
+    def analyze_indexes(self, top_n: Optional[int] = None) -> Dict:
+        """Compare queried field combinations against declared indexes"""
+        self.log("Analyzing Mongo queries against declared indexes...")
+        collections = self.find_collection_names()
+        receiver = r'(?<![\w$.])(Meteor\s*\.\s*users|[A-Za-z_$][\w$]*)\s*\.\s*(?:rawCollection\s*\(\s*\)\s*\.\s*)?'
+        query_call = receiver + r'(find|findOne|findOneAsync|update|updateAsync|remove|removeAsync|upsert|upsertAsync|' \
+                                r'countDocuments|findOneAndUpdate|updateOne|updateMany|deleteOne|deleteMany)\b'
+        index_call = receiver + r'(?:createIndex|createIndexAsync|ensureIndex|_ensureIndex)\b'
+
+        # Meteor's accounts packages create these on Meteor.users
+        indexes = defaultdict(list, {"Meteor.users": [
+            ["username"], ["emails.address"], ["services.resume.loginTokens.hashedToken"],
+            ["services.resume.loginTokens.token"], ["services.email.verificationTokens.token"],
+            ["services.password.reset.token"]
+        ]})
+        queries = defaultdict(list)  # (collection, fields, sort) -> call sites
+        unanalyzable = 0
+
+        for file_path in self.find_js_files():
+            relative_path = file_path.relative_to(self.root_dir).as_posix()
+            if not (relative_path.startswith(("imports/api/", "imports/startup/server/", "server/"))):
+                continue
+            try:
+                content, masked = self.read_source(file_path)
+            except (OSError, UnicodeDecodeError) as e:
+                self.log(f"Error reading {file_path}: {e}", "ERROR")
+                continue
+            starts = self.line_starts(content)
+
+            for match, open_index, close_index in self.iter_calls(masked, index_call):
+                collection = re.sub(r'\s+', '', match.group(1))
+                arguments = self.split_call_arguments(masked, open_index, close_index)
+                entries = self.object_entries(content, masked, *arguments[0]) if arguments else None
+                if entries:
+                    indexes[collection].append([key for key, _, _ in entries])
+
+            for match, open_index, close_index in self.iter_calls(masked, query_call):
+                collection = re.sub(r'\s+', '', match.group(1))
+                if collection not in collections:
+                    continue  # Array.prototype.find and friends
+                arguments = self.split_call_arguments(masked, open_index, close_index)
+                line_num = self.offset_to_line(starts, match.start())
+
+                shapes = self.selector_shapes(content, masked, *arguments[0]) if arguments else [set()]
+                if shapes is None:
+                    unanalyzable += 1
+                    continue
+
+                sort_keys = []
+                if len(arguments) > 1 and match.group(2).startswith("find"):
+                    for key, value_start, value_end in self.object_entries(content, masked, *arguments[1]) or []:
+                        if key == "sort":
+                            sort_keys = [k for k, _, _ in self.object_entries(content, masked, value_start, value_end) or []]
+
+                for shape in shapes:
+                    if not shape and not sort_keys:
+                        continue  # Whole-collection reads cannot use an index anyway
+                    queries[(collection, tuple(sorted(shape)), tuple(sort_keys))].append(f"{relative_path}:{line_num}")
+
+        missing = []
+        for (collection, fields, sort_keys), call_sites in queries.items():
+            if self.index_supports(indexes.get(collection, []), set(fields), list(sort_keys)):
+                continue
+            missing.append({
+                "collection": collection,
+                "collection_name": collections.get(collection, collection),
+                "fields": list(fields),
+                "sort": list(sort_keys),
+                "call_sites": sorted(call_sites),
+                "count": len(call_sites)
+            })
+        missing.sort(key=lambda item: (-item["count"], item["collection"], item["fields"], item["sort"]))
+
+        return {
+            "indexes": {collection: specs for collection, specs in sorted(indexes.items())},
+            "unindexed_queries": missing[:top_n] if top_n else missing,
+            "total_query_shapes": len(queries),
+            "unanalyzable_calls": unanalyzable
+        }
+
+    def index_supports(self, index_specs: List[List[str]], fields: Set[str], sort_keys: List[str]) -> bool:
+        """An index helps when its leading key is filtered on (or, for pure sorts, sorted on)"""
+        if "_id" in fields:
+            return True
+        for spec in index_specs:
+            if not spec:
+                continue
+            if spec[0] in fields:
+                return True
+            if not fields and sort_keys and spec[0] == sort_keys[0]:
+                return True
+        return False
+
+    def print_index_report(self, report: Dict):
+        """Print queried field combinations without a supporting index"""
+        table = Table(title="🗂️  Queries Without a Supporting Index", show_header=True, header_style="bold magenta")
+        table.add_column("Collection", style="cyan")
+        table.add_column("Filter Fields")
+        table.add_column("Sort")
+        table.add_column("Call Sites", justify="center")
+        table.add_column("First Call Site", style="dim")
+        for item in report["unindexed_queries"]:
+            table.add_row(item["collection"], ", ".join(item["fields"]) or "—", ", ".join(item["sort"]) or "—",
+                          str(item["count"]), item["call_sites"][0])
+        console.print(table)
+        console.print(f"[dim]{report['total_query_shapes']} query shapes analyzed, "
+                      f"{report['unanalyzable_calls']} calls with dynamic selectors skipped[/dim]")
+
+    def find_loop_spans(self, masked: str) -> List[Tuple[int, int, str, int]]:
+        """(body start, body end, loop kind, keyword offset) for loops and iteration callbacks"""
+        spans = []
+
+        for match in re.finditer(r'\b(for|while)\s*(?:await\s*)?\(', masked):
+            header_close = self.find_closing_bracket(masked, match.end() - 1)
+            if header_close == -1:
+                continue
+            body_start = header_close + 1
+            while body_start < len(masked) and masked[body_start].isspace():
+                body_start += 1
+            if body_start < len(masked) and masked[body_start] == '{':
+                body_end = self.find_closing_bracket(masked, body_start)
+            else:
+                body_end = masked.find(';', body_start)
+            if body_end == -1:
+                continue
+            header = masked[match.end():header_close]
+            kind = match.group(1)
+            if kind == "for" and re.search(r'\bof\b', header):
+                kind = "for…of"
+            elif kind == "for" and re.search(r'\bin\b', header):
+                kind = "for…in"
+            spans.append((body_start, body_end, kind, match.start()))
+
+        for match in re.finditer(r'\bdo\s*\{', masked):
+            body_end = self.find_closing_bracket(masked, match.end() - 1)
+            if body_end != -1:
+                spans.append((match.end() - 1, body_end, "do…while", match.start()))
+
+        callback = r'\.\s*(forEach|map|filter|some|every|reduce|flatMap|forEachAsync|mapAsync)'
+        for match, open_index, close_index in self.iter_calls(masked, callback):
+            spans.append((open_index, close_index, f".{match.group(1)}()", match.start()))
+
+        return spans
+
+    def check_n_plus_one(self) -> List[Dict]:
+        """Find database calls inside loops and iteration callbacks in methods and server startup code"""
+        self.log("Checking for N+1 query patterns...")
+        findings = []
+        collections = self.find_collection_names()
+        db_call = r'(?<![\w$.])(Meteor\s*\.\s*users|[A-Za-z_$][\w$]*)\s*\.\s*' \
+                  r'(find|findOne|findOneAsync|update|updateAsync|upsert|upsertAsync|remove|removeAsync)\b'
+
+        for file_path in self.find_js_files():
+            relative_path = file_path.relative_to(self.root_dir).as_posix()
+            in_methods = relative_path.startswith("imports/api/") and file_path.stem.endswith("Methods")
+            if not (in_methods or relative_path.startswith(("imports/startup/server/", "server/"))):
+                continue
+            try:
+                content, masked = self.read_source(file_path)
+            except (OSError, UnicodeDecodeError) as e:
+                self.log(f"Error reading {file_path}: {e}", "ERROR")
+                continue
+
+            loops = self.find_loop_spans(masked)
+            if not loops:
+                continue
+            starts = self.line_starts(content)
+
+            for match, open_index, close_index in self.iter_calls(masked, db_call):
+                collection = re.sub(r'\s+', '', match.group(1))
+                if collection not in collections:
+                    continue
+                enclosing = [loop for loop in loops if loop[0] < match.start() < loop[1]]
+                if not enclosing:
+                    continue
+                # Report against the innermost loop
+                _, _, loop_kind, loop_offset = max(enclosing, key=lambda loop: loop[0])
+                method = match.group(2)
+                line_num = self.offset_to_line(starts, match.start())
+                loop_line = self.offset_to_line(starts, loop_offset)
+
+                arguments = self.split_call_arguments(masked, open_index, close_index)
+                suggestion = self.batching_suggestion(content, masked, collection, method, arguments)
+                findings.append({"file": relative_path, "line": line_num, "loop_line": loop_line,
+                                 "loop": loop_kind, "call": f"{collection}.{method}", "suggestion": suggestion})
+                self.add_warning(f"{relative_path}:{line_num} - N+1 query: {collection}.{method}() inside {loop_kind} "
+                                 f"at line {loop_line}; {suggestion}",
+                                 "n-plus-one", relative_path, f"{collection}.{method}@{loop_kind}")
+
+        return findings
+
+    def batching_suggestion(self, content: str, masked: str, collection: str, method: str,
+                            arguments: List[Tuple[int, int]]) -> str:
+        """Suggest the $in query that replaces one call per loop iteration"""
+        if arguments and self.is_constant_selector(content[arguments[0][0]:arguments[0][1]]) \
+                and not method.startswith(("update", "upsert", "remove")):
+            return "the selector does not change between iterations; hoist the query above the loop"
+        shapes = self.selector_shapes(content, masked, *arguments[0]) if arguments else None
+        fields = sorted(shapes[0]) if shapes and len(shapes) == 1 else []
+        field = fields[0] if len(fields) == 1 else "_id"
+        if method.startswith(("update", "upsert")):
+            return f"batch with {collection}.updateAsync({{ {field}: {{ $in: values }} }}, modifier, {{ multi: true }})"
+        if method.startswith("remove"):
+            return f"batch with {collection}.removeAsync({{ {field}: {{ $in: values }} }})"
+        return f"batch with {collection}.find({{ {field}: {{ $in: values }} }}).fetchAsync() before the loop"
+
+    def check_resource_leaks(self) -> List[Dict]:
+        """Flag server observers and intervals that can hold memory or CPU for the life of the process"""
+        self.log("Checking server observers and intervals for resource leaks...")
+        findings = []
+        files = {path: None for path in self.find_server_files(".observe") + self.find_server_files("setInterval")}
+        collections = self.find_collection_names()
+
+        for file_path in files:
+            relative_path = file_path.relative_to(self.root_dir).as_posix()
+            content, masked = self.read_source(file_path)
+            starts = self.line_starts(content)
+            for finding in self.observer_leaks(content, masked, collections) + self.interval_leaks(content, masked):
+                line_num = self.offset_to_line(starts, finding.pop("offset"))
+                finding.update({"file": relative_path, "line": line_num})
+                findings.append(finding)
+                self.add_warning(f"{relative_path}:{line_num} - {finding['message']} "
+                                 f"(risk: {finding['risk']} - {finding['estimate']})",
+                                 finding["kind"], relative_path, finding["specifier"])
+
+        return findings
+
+    def assigned_handle(self, masked: str, offset: int) -> Tuple[Optional[str], bool]:
+        """Name a call result at offset is assigned to, and whether it is returned to the caller instead"""
+        before = masked[max(0, offset - 200):offset]
+        if re.search(r'\breturn\s+(?:await\s+)?$', before):
+            return None, True
+        match = re.search(r'([A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*)\s*=\s*(?:await\s+)?$', before)
+        return (match.group(1) if match else None), False
+
+    def observer_leaks(self, content: str, masked: str, collections: Dict[str, str]) -> List[Dict]:
+        """Unbounded observers and observe handles that are never stopped"""
+        findings = []
+        publish_spans = [(open_index, close_index) for _, open_index, close_index
+                         in self.iter_calls(masked, r'\bMeteor\s*\.\s*publish')]
+        cursors = {}
+        for match, open_index, close_index in self.iter_calls(
+                masked, r'(Meteor\s*\.\s*users|[A-Za-z_$][\w$]*)\s*\.\s*find'):
+            collection = re.sub(r'\s+', '', match.group(1))
+            if collection in collections:
+                cursors[close_index] = (collection, match.start(), open_index)
+
+        for match, _, _ in self.iter_calls(masked, r'\.\s*(observe|observeChanges)(?:Async)?'):
+            method = match.group(1)
+            receiver_end = match.start() - 1
+            while receiver_end >= 0 and masked[receiver_end].isspace():
+                receiver_end -= 1
+            cursor = cursors.get(receiver_end)
+            if cursor:
+                collection, receiver_start, find_open = cursor
+            else:
+                receiver = re.search(r'[\w$.]+$', masked[:receiver_end + 1])
+                if not receiver:
+                    continue
+                collection, receiver_start, find_open = receiver.group(0), receiver.start(), None
+
+            in_publication = any(start < match.start() < end for start, end in publish_spans)
+
+            if find_open is not None:
+                find_arguments = self.split_call_arguments(masked, find_open, self.find_closing_bracket(masked, find_open))
+                selector = content[find_arguments[0][0]:find_arguments[0][1]].strip() if find_arguments else ""
+                options = content[find_arguments[1][0]:find_arguments[1][1]] if len(find_arguments) > 1 else ""
+                if re.fullmatch(r'\{\s*\}|', selector):
+                    projected = re.search(r'\b(?:fields|projection)\s*:', options) is not None
+                    if projected:
+                        risk, estimate = "medium", (f"one cached entry per {collection} document, callbacks on every "
+                                                    f"{collection} write")
+                    else:
+                        risk, estimate = "high", (f"every {collection} document held in server RAM, callbacks on "
+                                                  f"every {collection} write")
+                    findings.append({"offset": receiver_start, "kind": "observer-unbounded", "risk": risk,
+                                     "estimate": estimate, "specifier": f"{collection}.{method}#unbounded",
+                                     "message": f"{collection}.find({selector}).{method}() observes the whole "
+                                                f"collection{'' if projected else ' without a fields projection'}"})
+
+            handle, returned = self.assigned_handle(masked, receiver_start)
+            if returned:
+                continue
+            if handle and re.search(rf'(?<![\w$.]){re.escape(handle)}\s*(?:\?\.|\.)\s*stop\s*\(', masked):
+                continue
+            if in_publication:
+                risk, estimate = "high", "one observer leaked per subscription, never released after the client leaves"
+            else:
+                risk, estimate = "low", "lives until the process exits, duplicated on every hot code reload"
+            what = f"handle '{handle}' is never stopped" if handle else "handle is discarded and can never be stopped"
+            findings.append({"offset": receiver_start, "kind": "observer-unstopped", "risk": risk,
+                             "estimate": estimate, "specifier": f"{collection}.{method}#{handle or 'discarded'}",
+                             "message": f"{collection}.{method}() {what}"})
+
+        return findings
+
+    def interval_period(self, content: str, masked: str, expression: str) -> Optional[float]:
+        """Milliseconds of a constant interval period, following one level of const indirection"""
+        expression = expression.strip()
+        if re.fullmatch(r'[A-Za-z$][\w$]*', expression):
+            match = re.search(rf'\b{re.escape(expression)}\s*=\s*([\d\s*+\-/().]+?)\s*[;\n]', masked)
+            if not match:
+                return None
+            expression = content[match.start(1):match.end(1)]
+        expression = re.sub(r'(?<=\d)_(?=\d)', '', expression)
+        if not re.fullmatch(r'[\d\s*+\-/().]+', expression):
+            return None
+        try:
+            return self.evaluate_arithmetic(ast.parse(expression, mode='eval').body)
+        except (SyntaxError, ValueError, ZeroDivisionError, OverflowError, RecursionError, MemoryError):
+            return None
+
+    def evaluate_arithmetic(self, node: ast.AST) -> float:
+        """Value of a numeric literal expression using only + - * /, ValueError for anything else"""
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            return float(node.value)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+            operand = self.evaluate_arithmetic(node.operand)
+            return -operand if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub, ast.Mult, ast.Div)):
+            left, right = self.evaluate_arithmetic(node.left), self.evaluate_arithmetic(node.right)
+            if isinstance(node.op, ast.Add):
+                return left + right
+            if isinstance(node.op, ast.Sub):
+                return left - right
+            if isinstance(node.op, ast.Mult):
+                return left * right
+            return left / right
+        raise ValueError(f"unsupported expression: {ast.dump(node)}")
+
+    def interval_leaks(self, content: str, masked: str) -> List[Dict]:
+        """setInterval loops with no clearInterval and async bodies with no overlap guard"""
+        findings = []
+        db_work = re.compile(r'\.\s*(?:fetch|count|find|findOne|update|upsert|remove|insert|aggregate)\w*\s*\(')
+        guard = re.compile(r'\b[\w$.]*(?:running|inProgress|busy|locked|pending)\w*\s*=\s*true\b', re.IGNORECASE)
+
+        for match, open_index, close_index in self.iter_calls(
+                masked, r'(?<![\w$])(?:Meteor\s*\.\s*)?setInterval'):
+            arguments = self.split_call_arguments(masked, open_index, close_index)
+            if not arguments:
+                continue
+            body_start, body_end = arguments[0]
+            body = masked[body_start:body_end]
+            problems = []
+
+            handle, returned = self.assigned_handle(masked, match.start())
+            stopped = handle and re.search(
+                rf'\b(?:Meteor\s*\.\s*)?clearInterval\s*\(\s*{re.escape(handle)}\s*\)', masked)
+            if not (returned or stopped):
+                problems.append("is never cleared on shutdown")
+            is_async = re.match(r'\s*async\b', body) is not None or re.search(r'\bawait\b', body) is not None
+            if is_async and not guard.search(body):
+                problems.append("has no guard against overlapping runs")
+            if not problems:
+                continue
+
+            period = self.interval_period(content, masked, content[arguments[1][0]:arguments[1][1]]) \
+                if len(arguments) > 1 else None
+            touches_db = db_work.search(body) is not None
+            if period is None:
+                cadence = "unknown period"
+            elif period >= 3600000:
+                cadence = f"every {period / 3600000:g} h"
+            elif period >= 60000:
+                cadence = f"every {period / 60000:g} min"
+            else:
+                cadence = f"every {period / 1000:g} s"
+            if touches_db and is_async and (period is None or period <= 60000):
+                risk = "high"
+            elif touches_db or is_async:
+                risk = "medium"
+            else:
+                risk = "low"
+            work = "database work" if touches_db else "work"
+            estimate = f"{work} {cadence}"
+            if "has no guard against overlapping runs" in problems:
+                estimate += ", runs stack up when a tick outlasts the period"
+
+            name = re.sub(r'[\s(]+', '', masked[match.start():match.end()])
+            findings.append({"offset": match.start(), "kind": "interval-leak", "risk": risk, "estimate": estimate,
+                             "specifier": f"{name}#{handle or cadence}",
+                             "message": f"{name}() {' and '.join(problems)}"})
+
+        return findings
+
+    def check_blocking_work(self) -> List[Dict]:
+        """Find Meteor methods and publications that reach CPU-heavy packages on the event loop"""
+        self.log(f"Checking methods and publications for CPU-heavy calls ({', '.join(self.heavy_packages)})...")
+        findings = []
+        files = {path: None for path in self.find_server_files("Meteor.methods") + self.find_server_files("Meteor.publish")}
+
+        for file_path in files:
+            relative_path = file_path.relative_to(self.root_dir).as_posix()
+            content, masked = self.read_source(file_path)
+            heavy = self.heavy_symbols(file_path)
+            if not heavy:
+                continue
+            starts = self.line_starts(content)
+
+            for kind, name, body_start, body_end in self.server_entry_points(content, masked):
+                reached = {}
+                for reference in self.referenced_names(masked, body_start, body_end):
+                    if reference in heavy and heavy[reference][1] not in reached:
+                        reached[heavy[reference][1]] = heavy[reference][0]
+
+                line_num = self.offset_to_line(starts, body_start)
+                for package, chain in reached.items():
+                    call_chain = " → ".join([name] + chain)
+                    findings.append({"file": relative_path, "line": line_num, "kind": kind, "name": name,
+                                     "package": package, "chain": [name] + chain})
+                    self.add_warning(f"{relative_path}:{line_num} - {kind.capitalize()} '{name}' runs CPU-heavy "
+                                     f"'{package}' on the event loop: {call_chain}; move it to a worker pool",
+                                     "blocking-work", relative_path, f"{name}#{package}")
+
+        return findings
+
+    def server_entry_points(self, content: str, masked: str) -> List[Tuple[str, str, int, int]]:
+        """(kind, name, body start, body end) of each Meteor method and publication handler in a file"""
+        entries = []
+
+        for _, open_index, close_index in self.iter_calls(masked, r'\bMeteor\s*\.\s*methods'):
+            arguments = self.split_call_arguments(masked, open_index, close_index)
+            if not arguments or masked[arguments[0][0]] != '{':
+                continue
+            object_close = self.find_closing_bracket(masked, arguments[0][0])
+            for entry_start, entry_end in self.split_call_arguments(masked, arguments[0][0], object_close):
+                key_match = re.match(r'(?:async\s+)?(?:(["\'])(.*?)\1|([\w$]+))\s*[(:]', masked[entry_start:entry_end])
+                if not key_match:
+                    continue
+                if key_match.group(1):
+                    name = content[entry_start + key_match.start(2):entry_start + key_match.end(2)]
+                else:
+                    name = key_match.group(3)
+                entries.append(("method", name, entry_start + key_match.end() - 1, entry_end))
+
+        for _, open_index, close_index in self.iter_calls(masked, r'\bMeteor\s*\.\s*publish'):
+            arguments = self.split_call_arguments(masked, open_index, close_index)
+            if len(arguments) < 2:
+                continue
+            name = content[arguments[0][0]:arguments[0][1]].strip('"\'`')
+            entries.append(("publication", name, arguments[1][0], arguments[1][1]))
+
+        return entries
+
+    def referenced_names(self, masked: str, start: int, end: int) -> Set[str]:
+        """Free identifiers used in a span, ignoring property names after a dot"""
+        return set(re.findall(r'(?<![\w$.])(?<!\.\s)([A-Za-z_$][\w$]*)', masked[start:end]))
+
+    def function_spans(self, masked: str) -> List[Tuple[Optional[str], int, int]]:
+        """(name or None, body start, body end) for function declarations, expressions and arrows"""
+        spans = []
+        for match in re.finditer(r'=>\s*\{|\)\s*\{', masked):
+            body_start = match.end() - 1
+            if masked[match.start()] == ')':
+                params_open = self.find_opening_bracket(masked, match.start())
+                if params_open == -1:
+                    continue
+                before = masked[:params_open].rstrip()
+                if re.search(r'\b(?:if|for|while|switch|catch|with)$', before):
+                    continue
+                header = re.search(r'(?:function\s*\*?\s*([\w$]+)|([\w$]+)\s*=\s*(?:async\s+)?function\s*\*?|'
+                                   r'([\w$]+)\s*=\s*(?:async\s*)?)$', before)
+            else:
+                params_end = masked[:match.start()].rstrip()
+                params_open = self.find_opening_bracket(masked, len(params_end) - 1) \
+                    if params_end.endswith(')') else len(params_end) - len(re.search(r'[\w$]*$', params_end).group(0))
+                header = re.search(r'([\w$]+)\s*=\s*(?:async\s*)?$', masked[:max(params_open, 0)].rstrip() + ' ') \
+                    if params_open != -1 else None
+            body_end = self.find_closing_bracket(masked, body_start)
+            if body_end == -1:
+                continue
+            name = next((group for group in header.groups() if group), None) if header else None
+            spans.append((name, body_start, body_end))
+        return spans
+
+    def find_opening_bracket(self, masked: str, close_index: int) -> int:
+        """Index of the bracket opening the one at close_index, -1 if unbalanced"""
+        pairs = {')': '(', ']': '[', '}': '{'}
+        opener = pairs[masked[close_index]]
+        closer = masked[close_index]
+        depth = 0
+        for index in range(close_index, -1, -1):
+            char = masked[index]
+            if char == closer:
+                depth += 1
+            elif char == opener:
+                depth -= 1
+                if depth == 0:
+                    return index
+        return -1
+
+    def heavy_symbols(self, file_path: Path, visiting: Optional[Set[Path]] = None) -> Dict[str, Tuple[List[str], str]]:
+        """Module-level names in a file that reach a CPU-heavy package, mapped to (call chain, package)"""
+        if file_path in self.heavy_cache:
+            return self.heavy_cache[file_path]
+        visiting = visiting or set()
+        if file_path in visiting:
+            return {}
+        visiting.add(file_path)
+
+        try:
+            content, masked = self.read_source(file_path)
+        except (OSError, UnicodeDecodeError) as e:
+            self.log(f"Error reading {file_path}: {e}", "ERROR")
+            return {}
+
+        heavy = {}
+        packages = "|".join(re.escape(package) for package in self.heavy_packages)
+        source = rf'["\'](?P<package>{packages})(?:/[^"\']*)?["\']'
+        bindings = [
+            rf'import\s+(?:(?P<default>[\w$]+)\s*,?\s*)?(?:\{{(?P<named>[^}}]*)\}}|\*\s*as\s+(?P<namespace>[\w$]+))?\s*from\s*{source}',
+            rf'(?:const|let|var)\s+(?:(?P<default>[\w$]+)|\{{(?P<named>[^}}]*)\}})\s*=\s*(?:await\s+)?(?:require|import)\s*\(\s*{source}',
+        ]
+        for pattern in bindings:
+            for match in re.finditer(pattern, content):
+                package = match.group("package")
+                names = [match.groupdict().get("default"), match.groupdict().get("namespace")]
+                for item in (match.group("named") or "").split(','):
+                    names.append(re.split(r'\s+as\s+|\s*:\s*', item.strip())[-1])
+                for name in filter(None, names):
+                    heavy[name] = ([f"{name} ({package})"], package)
+
+        # Symbols imported from other project modules that reach a heavy package there
+        for match in re.finditer(r'import\s+(?:([\w$]+)\s*,?\s*)?(?:\{([^}]*)\})?\s*from\s*["\']([^"\']+)["\']', content):
+            default, named, specifier = match.groups()
+            if self.is_external_package(specifier):
+                continue
+            target = self.resolve_import_path(specifier, file_path)
+            if not target or target.suffix not in self.js_extensions:
+                continue
+            remote = self.heavy_symbols(target, visiting)
+            target_label = target.relative_to(self.root_dir).as_posix()
+            imported = [("default", default)] if default else []
+            for item in (named or "").split(','):
+                parts = re.split(r'\s+as\s+', item.strip())
+                if parts[0]:
+                    imported.append((parts[0], parts[-1]))
+            for exported, local in imported:
+                if exported in remote:
+                    chain, package = remote[exported]
+                    if chain[0] == exported or chain[0].startswith(exported + " ("):
+                        chain = chain[1:]
+                    heavy[local] = ([f"{exported} ({target_label})"] + chain, package)
+
+        functions = self.function_spans(masked)
+        default_export = re.search(r'\bexport\s+default\s+([\w$]+)\s*;?', masked)
+
+        # Module-level assignments and functions inherit heaviness from the names they use
+        changed = True
+        while changed:
+            changed = False
+            for name, body_start, body_end in functions:
+                if not name or name in heavy:
+                    continue
+                for reference in sorted(self.referenced_names(masked, body_start, body_end)):
+                    if reference in heavy and reference != name:
+                        heavy[name] = ([name] + heavy[reference][0], heavy[reference][1])
+                        changed = True
+                        break
+            for match in re.finditer(r'(?<![\w$.])([A-Za-z_$][\w$]*)\s*=(?![=>])([^;\n]*)', masked):
+                name = match.group(1)
+                if name in heavy or any(start < match.start() < end for _, start, end in functions):
+                    continue
+                for reference in sorted(self.referenced_names(masked, match.start(2), match.end(2))):
+                    if reference in heavy:
+                        heavy[name] = ([name] + heavy[reference][0], heavy[reference][1])
+                        changed = True
+                        break
+
+        if default_export and default_export.group(1) in heavy:
+            heavy["default"] = heavy[default_export.group(1)]
+
+        self.heavy_cache[file_path] = heavy
+        return heavy
+
     def extract_import_details(self, file_path: Path, broken_import_path: str) -> Dict:
         """Extract what is being imported from a broken import statement"""
         import_details = {
@@ -737,7 +2477,8 @@ class RefChecker:
             "summary": {
                 "total_errors": len(self.errors),
                 "total_warnings": len(self.warnings),
-                "total_suggestions": len(self.suggestions)
+                "total_suggestions": len(self.suggestions),
+                "total_baselined": self.baselined_count
             }
         }
 
@@ -924,6 +2665,361 @@ class RefChecker:
             self.log(f"Error generating absolute path: {e}", "ERROR")
             return relative_import
 
+    def find_affected(self, changed_files: List[str]) -> Dict[str, List[str]]:
+        """Entry points, pages and test modules that transitively import any of the changed files"""
+        reverse_graph = defaultdict(set)
+        for importer, _, _, target in self.iter_resolved_imports():
+            reverse_graph[target].add(importer)
+
+        changed = set()
+        for changed_file in changed_files:
+            path = self.resolve_cli_path(changed_file, must_exist=False)
+            try:
+                changed.add(path.relative_to(self.root_dir).as_posix())
+            except ValueError:
+                self.log(f"Ignoring {changed_file}: outside {self.root_dir}")
+
+        affected = set(changed)
+        pending = list(changed)
+        while pending:
+            for importer in reverse_graph.get(pending.pop(), ()):
+                if importer not in affected:
+                    affected.add(importer)
+                    pending.append(importer)
+
+        entry_points = set(self.find_entry_points())
+        return {
+            "changed": sorted(changed),
+            "entry_points": sorted(affected & entry_points),
+            "pages": sorted(f for f in affected if f.startswith("imports/ui/pages/")),
+            "tests": sorted(f for f in affected if f.startswith("imports/ui/test/")),
+            "all": sorted(affected)
+        }
+
+    def changed_files_since(self, ref: str) -> List[str]:
+        """Files changed relative to a git ref (committed, staged and unstaged), root-relative"""
+        result = subprocess.run(['git', 'diff', '--name-only', '--relative', ref, '--'],
+                                cwd=self.root_dir, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"git diff against '{ref}' failed: {result.stderr.strip()}")
+        return [line for line in result.stdout.splitlines() if line]
+
+    def print_affected_report(self, report: Dict):
+        """Print the affected entry points, pages and tests"""
+        console.print(f"🎯 [bold]{len(report['changed'])} changed file(s) affect {len(report['all'])} module(s)[/bold]")
+        for title, key in (("Entry points", "entry_points"), ("Pages", "pages"), ("Tests", "tests")):
+            console.print(f"\n[bold magenta]{title}[/bold magenta] ({len(report[key])})")
+            for path in report[key]:
+                console.print(f"  {path}")
+
+    def move_path(self, old: str, new: str) -> Dict:
+        """Move a file or directory and rewrite every import that refers to the moved files"""
+        old_path = self.resolve_cli_path(old)
+        new_path = self.resolve_cli_path(new, must_exist=False)
+        if not old_path.exists():
+            raise FileNotFoundError(f"Nothing to move at {old}")
+        if new_path.exists():
+            raise FileExistsError(f"Destination already exists: {new}")
+        try:
+            old_path.relative_to(self.root_dir)
+            new_path.relative_to(self.root_dir)
+        except ValueError:
+            raise ValueError(f"Both paths must be inside {self.root_dir}")
+
+        # Old -> new location of every moved file (root-relative posix paths)
+        if old_path.is_dir():
+            moved = {}
+            for file_path in old_path.rglob("*"):
+                if file_path.is_file():
+                    moved[file_path.relative_to(self.root_dir).as_posix()] = \
+                        (new_path / file_path.relative_to(old_path)).relative_to(self.root_dir).as_posix()
+        else:
+            moved = {old_path.relative_to(self.root_dir).as_posix(): new_path.relative_to(self.root_dir).as_posix()}
+
+        # Collect rewrites before touching the filesystem, while old specifiers still resolve
+        reverse_index = self.build_reverse_index()
+        index = self.load_import_index()
+        rewrites = defaultdict(list)  # new importer path -> [(line, old specifier, new specifier)]
+
+        for old_target, new_target in moved.items():
+            for importer, import_path, line_num in reverse_index.get(old_target, []):
+                if importer in moved:
+                    continue  # Handled below together with the moved file's own imports
+                new_import = self.rewrite_specifier(importer, import_path, old_target, new_target)
+                if new_import != import_path:
+                    rewrites[importer].append((line_num, import_path, new_import))
+
+        for old_importer, new_importer in moved.items():
+            entry = index.get(old_importer)
+            if not entry:
+                continue
+            old_importer_path = self.root_dir / old_importer
+            for import_path, line_num, _ in entry["imports"]:
+                if not import_path.startswith('.') and not import_path.startswith('/'):
+                    continue
+                resolved = self.resolve_import_path(import_path, old_importer_path)
+                if resolved is None:
+                    continue
+                try:
+                    old_target = resolved.relative_to(self.root_dir).as_posix()
+                except ValueError:
+                    continue
+                new_target = moved.get(old_target, old_target)
+                # Absolute imports only change when their target moved
+                if import_path.startswith('/') and new_target == old_target:
+                    continue
+                new_import = self.rewrite_specifier(new_importer, import_path, old_target, new_target)
+                if new_import != import_path:
+                    rewrites[new_importer].append((line_num, import_path, new_import))
+
+        self.move_on_disk(old_path, new_path)
+        self.invalidate_file_cache()
+
+        rewritten_imports = 0
+        for importer, changes in sorted(rewrites.items()):
+            if self.rewrite_import_lines(self.root_dir / importer, changes):
+                rewritten_imports += len(changes)
+                for line_num, import_path, new_import in changes:
+                    self.log(f"{importer}:{line_num} '{import_path}' → '{new_import}'", "SUCCESS")
+
+        # Moved and rewritten files are re-parsed next time under their new paths
+        for stale in list(moved) + list(rewrites):
+            self.import_index.pop(stale, None)
+        self.import_index_dirty = True
+        self.save_import_index()
+        self.import_index = None
+
+        return {
+            "moved_files": len(moved),
+            "updated_files": len(rewrites),
+            "updated_imports": rewritten_imports
+        }
+
+    def resolve_cli_path(self, path: str, must_exist: bool = True) -> Path:
+        """Interpret a command line path relative to the working directory, else to the root"""
+        candidate = Path(path).resolve()
+        if candidate.exists() or (not must_exist and candidate.parent.exists()):
+            try:
+                candidate.relative_to(self.root_dir)
+                return candidate
+            except ValueError:
+                pass
+        return (self.root_dir / path).resolve()
+
+    def rewrite_specifier(self, importer: str, import_path: str, old_target: str, new_target: str) -> str:
+        """Build the import path from importer to new_target, keeping the style of import_path"""
+        old_target_path = Path(old_target)
+        new_target_path = self.root_dir / new_target
+        specifier_name = import_path.rstrip('/').split('/')[-1]
+
+        # Keep directory imports of index files (while the new target is an index too) and explicit extensions
+        if old_target_path.stem == "index" and new_target_path.stem == "index" \
+                and specifier_name not in ("index", old_target_path.name):
+            new_target_path = new_target_path.parent
+        elif specifier_name != old_target_path.name:
+            new_target_path = new_target_path.with_suffix('')
+
+        if import_path.startswith('.'):
+            relative_path = os.path.relpath(new_target_path, (self.root_dir / importer).parent).replace('\\', '/')
+            if not relative_path.startswith('.'):
+                relative_path = './' + relative_path
+            return relative_path
+
+        project_root = self.find_project_root(self.root_dir / importer) or self.root_dir
+        try:
+            project_relative = new_target_path.relative_to(project_root).as_posix()
+        except ValueError:
+            project_relative = new_target_path.relative_to(self.root_dir).as_posix()
+        return '/' + project_relative if import_path.startswith('/') else project_relative
+
+    def move_on_disk(self, old_path: Path, new_path: Path):
+        """Move with git mv when the path is tracked so history follows, otherwise a plain move"""
+        new_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.use_git:
+            result = subprocess.run(['git', 'mv', str(old_path), str(new_path)],
+                                    cwd=self.root_dir, capture_output=True, text=True)
+            if result.returncode == 0:
+                return
+            self.log(f"git mv failed, moving without git: {result.stderr.strip()}")
+        shutil.move(str(old_path), str(new_path))
+
+    def rewrite_import_lines(self, file_path: Path, changes: List[Tuple[int, str, str]]) -> bool:
+        """Replace quoted import paths on the given lines of a file"""
+        try:
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
+                lines = f.read().split('\n')
+
+            for line_num, import_path, new_import in changes:
+                if line_num > len(lines):
+                    continue
+                line = lines[line_num - 1]
+                for quote in ('"', "'", '`'):
+                    line = line.replace(f'{quote}{import_path}{quote}', f'{quote}{new_import}{quote}')
+                lines[line_num - 1] = line
+
+            with open(file_path, 'w', encoding='utf-8', newline='') as f:
+                f.write('\n'.join(lines))
+            return True
+
+        except Exception as e:
+            self.log(f"Error rewriting imports in {file_path}: {e}", "ERROR")
+            return False
+
+class RefServer:
+    """JSON-RPC 2.0 query server that keeps a RefChecker's import graph and caches resident"""
+
+    def __init__(self, checker: RefChecker, rescan_interval: float = 2.0):
+        self.checker = checker
+        self.rescan_interval = rescan_interval
+        self.last_rescan = 0.0
+        self.reverse_graph = None
+        self.running = True
+        self.methods = {
+            "ping": lambda params: "pong",
+            "resolve": self.resolve,
+            "importers": self.importers,
+            "importers-transitive": self.importers_transitive,
+            "exports": self.exports,
+            "broken": self.broken,
+            "refresh": self.refresh,
+            "shutdown": self.shutdown,
+        }
+
+    def refresh(self, params=None) -> bool:
+        """Bring the resident index up to date; file additions are picked up every rescan_interval"""
+        now = time.monotonic()
+        rescan = params is not None or now - self.last_rescan >= self.rescan_interval
+        if rescan:
+            self.last_rescan = now
+        if self.checker.refresh_import_index(rescan) or self.reverse_graph is None:
+            self.reverse_graph = defaultdict(set)
+            for importer, _, _, target in self.checker.iter_resolved_imports():
+                self.reverse_graph[target].add(importer)
+            return True
+        return False
+
+    def file_param(self, params, name: str = "file") -> Path:
+        value = params.get(name) if isinstance(params, dict) else (params[0] if params else None)
+        if not isinstance(value, str):
+            raise ValueError(f"Missing '{name}' parameter")
+        return self.checker.resolve_cli_path(value, must_exist=False)
+
+    def relative(self, path: Path) -> str:
+        return self.checker.relative_path_str(path).replace('\\', '/')
+
+    def resolve(self, params) -> Optional[str]:
+        if isinstance(params, dict):
+            specifier, from_file = params.get("specifier"), params.get("from")
+        else:
+            specifier, from_file = (list(params) + [None, None])[:2]
+        if not isinstance(specifier, str) or not isinstance(from_file, str):
+            raise ValueError("resolve needs 'specifier' and 'from'")
+        resolved = self.checker.resolve_import_path(specifier, self.checker.resolve_cli_path(from_file, must_exist=False))
+        return self.relative(resolved) if resolved else None
+
+    def importers(self, params) -> List[str]:
+        return sorted(self.reverse_graph.get(self.relative(self.file_param(params)), ()))
+
+    def importers_transitive(self, params) -> List[str]:
+        start = self.relative(self.file_param(params))
+        seen = set()
+        pending = [start]
+        while pending:
+            for importer in self.reverse_graph.get(pending.pop(), ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    pending.append(importer)
+        seen.discard(start)
+        return sorted(seen)
+
+    def exports(self, params) -> List[str]:
+        return sorted(self.checker.get_exports(self.file_param(params)))
+
+    def broken(self, params) -> List[Dict]:
+        file_path = self.file_param(params)
+        return [{"message": message, "kind": kind, "specifier": specifier}
+                for message, kind, specifier in self.checker.find_broken_imports(file_path)]
+
+    def shutdown(self, params=None) -> bool:
+        self.running = False
+        return True
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """Answer one JSON-RPC request line (None for notifications)"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            method = self.methods.get(request.get("method"))
+            if method is None:
+                error = {"code": -32601, "message": f"Method not found: {request.get('method')}"}
+            else:
+                if method is not self.refresh:
+                    self.refresh()
+                result = method(request.get("params") or {})
+                error = None
+        except json.JSONDecodeError as e:
+            error = {"code": -32700, "message": f"Parse error: {e}"}
+        except (ValueError, TypeError, AttributeError) as e:
+            error = {"code": -32602, "message": str(e)}
+        except Exception as e:
+            error = {"code": -32603, "message": str(e)}
+
+        if request_id is None and error is None:
+            return None
+        response = {"jsonrpc": "2.0", "id": request_id}
+        if error:
+            response["error"] = error
+        else:
+            response["result"] = result
+        return json.dumps(response)
+
+    def serve_stdio(self):
+        """Line-delimited JSON-RPC over stdin/stdout"""
+        self.refresh()
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            response = self.handle_line(line)
+            if response is not None:
+                sys.stdout.write(response + "\n")
+                sys.stdout.flush()
+            if not self.running:
+                break
+        self.checker.save_import_index()
+
+    def serve_unix(self, socket_path: str):
+        """Line-delimited JSON-RPC over a Unix domain socket, one request at a time"""
+        if not hasattr(socketserver, "UnixStreamServer"):
+            raise RuntimeError("Unix domain sockets are not available on this platform")
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for raw_line in self.rfile:
+                    line = raw_line.decode('utf-8', errors='replace')
+                    if not line.strip():
+                        continue
+                    response = server.handle_line(line)
+                    if response is not None:
+                        self.wfile.write((response + "\n").encode('utf-8'))
+                        self.wfile.flush()
+                    if not server.running:
+                        break
+
+        self.refresh()
+        with socketserver.UnixStreamServer(socket_path, Handler) as unix_server:
+            console.print(f"🛰️  Serving import graph queries on {socket_path}")
+            try:
+                while self.running:
+                    unix_server.handle_request()
+            finally:
+                os.unlink(socket_path)
+                self.checker.save_import_index()
+
 def main():
     parser = argparse.ArgumentParser(description="Check references in React/Meteor codebase")
     parser.add_argument("--imports", action="store_true", help="Check import statements")
@@ -935,11 +3031,51 @@ def main():
     parser.add_argument("--fix", action="store_true", help="Suggest and automatically fix imports when possible")
     parser.add_argument("--convert-to-relative", action="store_true", help="Convert all absolute imports to relative imports")
     parser.add_argument("--convert-to-absolute", action="store_true", help="Convert all relative imports to absolute imports")
+    parser.add_argument("--publications", action="store_true", help="Lint Meteor publications for performance hazards")
+    parser.add_argument("--n-plus-one", action="store_true", help="Find database calls inside loops in methods and server code")
+    parser.add_argument("--resource-leaks", action="store_true",
+                        help="Find unbounded or unstopped observers and unguarded intervals in server code")
+    parser.add_argument("--blocking-work", action="store_true",
+                        help="Find methods and publications that call CPU-heavy packages")
+    parser.add_argument("--heavy-packages", metavar="LIST",
+                        help="Comma-separated CPU-heavy packages for --blocking-work "
+                             "(default: sharp,jsdom,canvas,svg-captcha)")
+    parser.add_argument("--perf", action="store_true", help="Run all Meteor performance rule packs")
+    parser.add_argument("--critical-path", action="store_true", help="Report eager startup import chains and fan-in")
+    parser.add_argument("--index-advisor", action="store_true", help="Report Mongo queries without a supporting index")
+    parser.add_argument("--top", type=int, default=10, help="Number of entries to show in ranked reports")
+    parser.add_argument("--json", action="store_true", help="Print analysis reports as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="Only report findings not present in this baseline file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write all current findings to the --baseline file")
+    parser.add_argument("--ignore-dir", action="append", default=[], metavar="NAME",
+                        help="Additional directory name to skip while scanning (can be used multiple times)")
+    parser.add_argument("--no-git", action="store_true", help="Walk the filesystem instead of using git ls-files")
+    parser.add_argument("--move", nargs=2, metavar=("OLD", "NEW"),
+                        help="Move a file or directory and rewrite all imports that refer to it")
+    parser.add_argument("--affected", nargs="+", metavar="FILE",
+                        help="List entry points, pages and tests that transitively import the given files")
+    parser.add_argument("--affected-since", metavar="REF",
+                        help="Like --affected, for every file changed since a git ref")
+    parser.add_argument("--serve", action="store_true",
+                        help="Answer JSON-RPC graph queries over stdio (or --socket) with the graph kept in memory")
+    parser.add_argument("--socket", metavar="PATH", help="Unix socket path for --serve")
+    parser.add_argument("--index-file", metavar="FILE",
+                        help="Where to keep the persistent import index (default: .meteor/local/checkrefs-index.json)")
     parser.add_argument("--root", default=".", help="Root directory to check")
 
     args = parser.parse_args()
 
-    checker = RefChecker(args.root, args.verbose, args.fix)
+    if args.update_baseline and not args.baseline:
+        parser.error("--update-baseline requires --baseline FILE")
+
+    if args.serve and not args.socket:
+        # stdout carries the protocol, so all console output goes to stderr
+        global console
+        console = Console(stderr=True)
+
+    checker = RefChecker(args.root, args.verbose, args.fix, set(args.ignore_dir), not args.no_git, args.index_file)
+    if args.baseline and not args.update_baseline:
+        checker.load_baseline(args.baseline)
 
     try:
         # Handle conversion modes - these skip all other operations
@@ -953,8 +3089,59 @@ def main():
             console.print(f"✅ Conversion complete! Converted {converted_count} files to absolute imports.")
             return
 
+        if args.serve:
+            server = RefServer(checker)
+            if args.socket:
+                server.serve_unix(args.socket)
+            else:
+                server.serve_stdio()
+            return 0
+
+        if args.move:
+            summary = checker.move_path(*args.move)
+            console.print(f"✅ Moved {summary['moved_files']} file(s), updated {summary['updated_imports']} "
+                          f"import(s) in {summary['updated_files']} file(s).")
+            return 0
+
+        if args.affected or args.affected_since:
+            changed_files = list(args.affected or [])
+            if args.affected_since:
+                changed_files.extend(checker.changed_files_since(args.affected_since))
+            report = checker.find_affected(changed_files)
+            if args.json:
+                print(json.dumps(report, indent=2))
+            else:
+                checker.print_affected_report(report)
+            return 0
+
+        if args.index_advisor:
+            report = checker.analyze_indexes(args.top)
+            if args.json:
+                print(json.dumps(report, indent=2))
+            else:
+                checker.print_index_report(report)
+            return 0
+
+        if args.critical_path:
+            report = checker.analyze_critical_path(args.top)
+            if args.json:
+                print(json.dumps(report, indent=2))
+            else:
+                checker.print_critical_path_report(report)
+            return 0
+
         # Default to all checks if no specific check is requested and no conversion mode
-        if not any([args.imports, args.exports, args.circular, args.paths]):
+        if args.perf:
+            args.publications = True
+            args.n_plus_one = True
+            args.resource_leaks = True
+            args.blocking_work = True
+
+        if args.heavy_packages:
+            checker.heavy_packages = [package.strip() for package in args.heavy_packages.split(',') if package.strip()]
+
+        if not any([args.imports, args.exports, args.circular, args.paths, args.publications, args.n_plus_one,
+                    args.resource_leaks, args.blocking_work]):
             args.all = True
 
         if args.all:
@@ -970,9 +3157,7 @@ def main():
                     console.print("\n🔄 [bold blue]Re-running checks after applying fixes...[/bold blue]")
 
                     # Reset checker state for re-run
-                    checker.errors = []
-                    checker.warnings = []
-                    checker.suggestions = []
+                    checker.reset_results()
 
                     # Run checks again (without applying more fixes)
                     original_fix_mode = checker.fix
@@ -988,6 +3173,14 @@ def main():
                 broken_imports = checker.check_imports()
             if args.circular:
                 checker.check_circular_dependencies()
+            if args.publications:
+                checker.check_publications()
+            if args.n_plus_one:
+                checker.check_n_plus_one()
+            if args.resource_leaks:
+                checker.check_resource_leaks()
+            if args.blocking_work:
+                checker.check_blocking_work()
 
             # Generate fix suggestions if requested
             fix_applied = False
@@ -1012,6 +3205,11 @@ def main():
 
             report = checker.generate_report()
 
+        if args.update_baseline:
+            written = checker.write_baseline(args.baseline)
+            console.print(f"✅ Baseline updated: {written} findings written to {args.baseline}")
+            return 0
+
         # Create summary table
         table = Table(title="📊 Reference Check Summary", show_header=True, header_style="bold magenta")
         table.add_column("Type", style="dim", width=12)
@@ -1030,6 +3228,8 @@ def main():
         table.add_row("❌ Errors", str(error_count), "❌ Issues found" if error_count > 0 else "✅ Clean", style=error_style)
         table.add_row("⚠️  Warnings", str(warning_count), "⚠️ Attention needed" if warning_count > 0 else "✅ Clean", style=warning_style)
         table.add_row("💡 Suggestions", str(suggestion_count), "💡 Improvements" if suggestion_count > 0 else "✅ Clean", style=suggestion_style)
+        if args.baseline:
+            table.add_row("🗂️  Baselined", str(report['summary']['total_baselined']), "Known, not reported", style="dim")
 
         console.print()
         console.print(table)
@@ -1045,5 +3245,8 @@ def main():
         console.print(Panel.fit(f"❌ [bold red]Error running reference check: {e}[/bold red]", border_style="red"))
         return 1
 
+    finally:
+        checker.save_import_index()
+
 if __name__ == "__main__":
     exit(main())
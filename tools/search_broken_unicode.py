@@ -10,14 +10,20 @@ Usage:
     search_broken_unicode.py --pattern "��" src/
     search_broken_unicode.py --encoding-issues --recursive .
     search_broken_unicode.py --fix --backup src/file.py
+    search_broken_unicode.py --fix --dry-run --recursive src/
 
 Features:
     - Detects common broken unicode patterns (�, ��, etc.)
     - Identifies encoding mismatches
     - Recursive directory scanning
     - Multiple encoding detection
-    - Optional fixing with backup
+    - Optional fixing with backup (one compressed archive per run) or as a dry-run diff
     - Detailed reporting
+    - Byte-level fast path: clean UTF-8 files are never decoded
+    - Content sniffing: binary files are skipped after reading their first 8 KB
+    - Compact issue records: context is read back from the file only when reporting
+    - JSON Lines report (--json)
+    - Mojibake reversal: double-encoded UTF-8 (cp1252, latin-1, cp1254) is detected and restored
 """
 
 import sys
@@ -25,12 +31,28 @@ import os
 import argparse
 import re
 import chardet
-from charset_normalizer import from_path
+from charset_normalizer import from_bytes
 from pathlib import Path
 import shutil
+import tarfile
+import io
 from datetime import datetime
 import subprocess
 import json
+import mmap
+import hashlib
+import codecs
+import difflib
+import heapq
+import unicodedata
+from collections import Counter, OrderedDict
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
 
 try:
     from tqdm import tqdm
@@ -60,10 +82,48 @@ except ImportError:
         def close(self):
             print(f"{self.desc}: {self.n}/{self.total} ✅")
 
+        def set_postfix_str(self, s=""):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self.close()
+
+# Bump when the scanner's output for the same file and options changes
+SCAN_CACHE_VERSION = 5
+
+
+class IssueRecord:
+    """One broken unicode occurrence, stored as positions rather than text
+
+    file_id and pattern_id index the searcher's file_table and pattern_table;
+    column and length give the span on the line. The matched text and its
+    line are sliced from the file only when a report needs them.
+    """
+    __slots__ = ('file_id', 'line', 'column', 'length', 'pattern_id', 'git_suggestion', 'provenance',
+                 'encoding_reversal')
+
+    def __init__(self, file_id, line, column, length, pattern_id):
+        self.file_id = file_id
+        self.line = line
+        self.column = column
+        self.length = length
+        self.pattern_id = pattern_id
+        self.git_suggestion = None
+        self.provenance = None
+        self.encoding_reversal = None
+
+    def match_in(self, line_content):
+        """The matched text, given the content of the record's line"""
+        return line_content[self.column - 1:self.column - 1 + self.length]
+
+
 class BrokenUnicodeSearcher:
     """Search for and optionally fix broken unicode characters"""
 
-    def __init__(self):
+    def __init__(self, check_git=True):
         # Common broken unicode patterns
         self.broken_patterns = [
             r'�',           # Replacement character
@@ -80,6 +140,55 @@ class BrokenUnicodeSearcher:
             r'â[^\s]{2,}',   # Patterns starting with â (E2 in Windows-1254)
         ]
 
+        # Patterns the byte-level fast path is known to cover
+        self.default_patterns = list(self.broken_patterns)
+
+        # UTF-8 encodings of every character a default pattern can start with, plus the
+        # lead characters of common mojibake: U+FFFD, Â, â, ğ, Ã and ð
+        self.fast_path_needles = [
+            '\ufffd'.encode('utf-8'),
+            '\u00c2'.encode('utf-8'),
+            '\u00e2'.encode('utf-8'),
+            '\u011f'.encode('utf-8'),
+            '\u00c3'.encode('utf-8'),
+            '\u00f0'.encode('utf-8'),
+        ]
+
+        # Encoding detection: memoized results and how many files each tier classified
+        self.byte_order_marks = [
+            (codecs.BOM_UTF32_LE, 'utf-32'), (codecs.BOM_UTF32_BE, 'utf-32'),
+            (codecs.BOM_UTF8, 'utf-8-sig'),
+            (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'),
+        ]
+        self.encoding_cache = {}
+        self.encoding_tiers = Counter()
+
+        # Content sniffing: bytes read from the head of each file, shared with the fast path and detection
+        self.sniff_size = 8192
+        # Short ASCII magics carry their version or header bytes too, so a text file that merely
+        # starts with the same letters ("ID3 tags ...", "RIFF notes") is not taken for binary
+        self.binary_magic_numbers = re.compile(b'|'.join([
+            rb'\x89PNG', rb'GIF8[79]a', rb'\xff\xd8\xff', rb'%PDF-\d\.\d', rb'PK\x03\x04', rb'PK\x05\x06',
+            rb'\x1f\x8b', rb'BZh[1-9](?:1AY&SY|\x17rE8P\x90)', rb'\xfd7zXZ\x00', rb'7z\xbc\xaf\x27\x1c', rb'Rar!\x1a\x07',
+            rb'\x7fELF', rb'\xca\xfe\xba\xbe', rb'\xcf\xfa\xed\xfe', rb'\xce\xfa\xed\xfe', rb'\x00asm',
+            rb'SQLite format 3\x00', rb'wOF[F2](?:\x00\x01\x00\x00|OTTO|true)', rb'OTTO\x00',
+            rb'\x00\x01\x00\x00', rb'\x00\x00\x01\x00', rb'RIFF.{4}(?:WAVE|AVI |WEBP|RMID|ACON)',
+            rb'OggS\x00', rb'fLaC[\x00\x80]', rb'ID3[\x02-\x04]\x00', rb'\x1aE\xdf\xa3',
+        ]), re.DOTALL)
+        # C0 controls other than tab, newline, form feed, carriage return and escape
+        self.control_bytes = bytes(byte for byte in range(32) if byte not in (9, 10, 12, 13, 27))
+
+        # Mojibake reversal: UTF-8 that was decoded through one of these codecs and saved again
+        self.reverse_mojibake = True
+        self.mojibake_encodings = ['cp1252', 'latin-1', 'cp1254']
+        self.script_cache = {}
+        self.reversal_cache = OrderedDict()  # LRU of (left neighbour, run, right neighbour) -> reversal or ()
+        self.reversal_cache_size = 4096
+        self.build_mojibake_tables()
+
+        # Directories never scanned
+        self.excluded_dirs = {'node_modules', 'build', '.meteor', 'archive'}
+
         # File extensions to check by default
         self.default_extensions = {
             '.py', '.js', '.jsx', '.ts', '.tsx', '.html', '.css', '.scss',
@@ -87,8 +196,30 @@ class BrokenUnicodeSearcher:
         }
 
         self.results = []
-        self.git_available = self.check_git_available()
+        self.scanned_lines = {}  # file -> {line number: text as scanned} of flagged lines, once --fix rewrote it
+        # Issue records refer to files and patterns by index into these tables
+        self.file_table = []
+        self.file_ids = {}
+        self.pattern_table = []
+        self.pattern_ids = {}
+        self.git_available = self.check_git_available() if check_git else False
         self.git_cache = {}  # Cache git results to avoid repeated calls
+        self.git_root = None
+        self.cat_file_process = None
+        self.blob_cache = OrderedDict()  # LRU of "commit:path" -> decoded lines
+        self.blob_cache_size = 256
+        self.history_index = {}  # File -> inverted index of its historical lines
+        self.suggestion_cache = {}  # (file, broken line) -> suggestion
+        self.word_pattern = re.compile(r'\w+')
+        self.provenance = False  # Blame each corrupted line instead of searching recent history
+        self.scan_cache = None  # Path -> cached scan entry, None when --cache is not used
+        self.scan_cache_path = None
+        self.backup_archive = None  # One tar.gz of original files per fixing run
+        self.backup_archive_path = None
+        self.backup_count = 0
+        self.line_mapping_cache = OrderedDict()  # LRU of (commit, path, parent commit, parent path) -> opcodes
+        self.line_mapping_cache_size = 256
+        self.compiled_patterns = {}  # Pattern tuple -> (combined regex, [(pattern, compiled)] in list order)
 
     def check_git_available(self):
         """Check if git is available and we're in a git repository"""
@@ -99,198 +230,636 @@ class BrokenUnicodeSearcher:
         except Exception:
             return False
 
-    def get_file_git_history(self, file_path, max_commits=10):
-        """Get git history for entire file (more efficient than per-line)"""
-        if not self.git_available:
+    def git_toplevel(self):
+        """Root of the current git work tree, None outside a repository"""
+        if self.git_root is None:
+            try:
+                result = subprocess.run(['git', 'rev-parse', '--show-toplevel'],
+                                        capture_output=True, text=True, cwd='.')
+                self.git_root = Path(result.stdout.strip()).resolve() if result.returncode == 0 else False
+            except Exception:
+                self.git_root = False
+        return self.git_root or None
+
+    def git_relative_path(self, file_path):
+        """Repository-relative posix path of file_path, None when it is outside the work tree"""
+        toplevel = self.git_toplevel()
+        if not toplevel:
+            return None
+        try:
+            return Path(file_path).resolve().relative_to(toplevel).as_posix()
+        except ValueError:
             return None
 
-        cache_key = f"{file_path}_{max_commits}"
-        if cache_key in self.git_cache:
-            return self.git_cache[cache_key]
+    def prefetch_git_history(self, file_paths, max_commits=10, chunk_size=200):
+        """Load history for many files with one `git log` walk and the shared cat-file process
 
-        try:
-            # Use git log -p to get all changes to the file
-            cmd = ['git', 'log', '-p', '--follow', f'-{max_commits}', file_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd='.')
-            if result.returncode != 0:
-                return None
+        For each of a file's last max_commits commits this keeps the lines that
+        commit added, in the shape the per-file patch parser used to produce:
+        {short commit: {stripped line: line}}. Renames are not followed.
+        """
+        if not self.git_available:
+            return
 
-            # Parse commits and their changes
-            commits = {}
-            lines = result.stdout.split('\n')
-            current_commit = None
-            current_changes = {}
-
-            for line in lines:
-                if line.startswith('commit '):
-                    if current_commit and current_changes:
-                        commits[current_commit] = current_changes
-                    current_commit = line.split()[1][:8]  # Short hash
-                    current_changes = {}
-                elif line.startswith('+') and not line.startswith('+++') and len(line) > 1:
-                    # This is an added line
-                    added_line = line[1:]  # Remove + prefix
-                    # Store by content for easy lookup
-                    content_key = added_line.strip()
-                    if content_key:
-                        current_changes[content_key] = added_line
-
-            # Don't forget the last commit
-            if current_commit and current_changes:
-                commits[current_commit] = current_changes
+        pending = {}
+        for file_path in file_paths:
+            cache_key = f"{file_path}_{max_commits}"
+            if cache_key in self.git_cache:
+                continue
+            relative_path = self.git_relative_path(file_path)
+            if relative_path is None:
+                self.git_cache[cache_key] = None
+            else:
+                pending[relative_path] = cache_key
+        if not pending:
+            return
+
+        # One history walk per chunk of paths, stopped as soon as every path has its commits
+        commits_by_path = {relative_path: [] for relative_path in pending}
+        paths = sorted(pending)
+        for start in range(0, len(paths), chunk_size):
+            chunk = paths[start:start + chunk_size]
+            open_paths = set(chunk)
+            # -z keeps non-ASCII paths unquoted: fields end in NUL, commits are marked with \x01
+            cmd = ['git', 'log', '-z', '--format=%x01%H', '--name-only', '--no-renames', '--'] + chunk
+            try:
+                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                           cwd=self.git_toplevel())
+            except OSError:
+                return
+            commit = None
+            for field in self.read_nul_fields(process.stdout):
+                field = field.lstrip('\n')
+                if field.startswith('\x01'):
+                    commit = field[1:]
+                elif field in open_paths and commit:
+                    commits_by_path[field].append(commit)
+                    if len(commits_by_path[field]) >= max_commits:
+                        open_paths.discard(field)
+                        if not open_paths:
+                            break
+            process.kill()
+            process.wait()
 
+        # Lines each commit added: its version minus the previous one (the parent of the oldest)
+        for relative_path, cache_key in pending.items():
+            commits = {}
+            history = commits_by_path[relative_path]
+            for index, commit in enumerate(history):
+                blob_lines = self.read_git_blob(commit, relative_path)
+                if blob_lines is None:
+                    continue
+                parent = history[index + 1] if index + 1 < len(history) else f"{commit}^"
+                previous = {line.strip() for line in self.read_git_blob(parent, relative_path) or []}
+                changes = {}
+                for line in blob_lines:
+                    content_key = line.strip()
+                    if content_key and content_key not in previous:
+                        changes[content_key] = line
+                if changes:
+                    commits[commit[:8]] = changes
             self.git_cache[cache_key] = commits
-            return commits
 
-        except Exception:
+    def read_nul_fields(self, stream, block_size=65536):
+        """Yield the NUL-terminated fields of a binary stream as text, as they arrive"""
+        pending = b''
+        for block in iter(lambda: stream.read1(block_size), b''):
+            *fields, pending = (pending + block).split(b'\0')
+            for field in fields:
+                yield field.decode('utf-8', errors='replace')
+        if pending:
+            yield pending.decode('utf-8', errors='replace')
+
+    def read_git_blob(self, commit, relative_path):
+        """Lines of relative_path at commit, read through one long-lived `git cat-file --batch`"""
+        spec = f"{commit}:{relative_path}"
+        if spec in self.blob_cache:
+            self.blob_cache.move_to_end(spec)
+            return self.blob_cache[spec]
+
+        try:
+            if self.cat_file_process is None or self.cat_file_process.poll() is not None:
+                self.cat_file_process = subprocess.Popen(['git', 'cat-file', '--batch'], stdin=subprocess.PIPE,
+                                                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                                         cwd=self.git_toplevel())
+            process = self.cat_file_process
+            process.stdin.write(spec.encode('utf-8') + b'\n')
+            process.stdin.flush()
+            header = process.stdout.readline().split()
+            if len(header) != 3:
+                return None  # "<spec> missing"
+            data = process.stdout.read(int(header[2]))
+            process.stdout.read(1)  # Trailing newline after the object
+        except (OSError, ValueError):
+            self.close_git()
             return None
 
-    def get_git_suggestion_from_cache(self, file_path, line_content):
-        """Get git suggestion from cached file history"""
-        file_history = self.get_file_git_history(file_path)
-        if not file_history:
+        lines = data.decode('utf-8', errors='replace').split('\n')
+        self.blob_cache[spec] = lines
+        if len(self.blob_cache) > self.blob_cache_size:
+            self.blob_cache.popitem(last=False)
+        return lines
+
+    def close_git(self):
+        """Stop the shared cat-file process"""
+        if self.cat_file_process is not None:
+            try:
+                self.cat_file_process.stdin.close()
+                self.cat_file_process.wait(timeout=5)
+            except Exception:
+                self.cat_file_process.kill()
+            self.cat_file_process = None
+
+    def get_file_git_history(self, file_path, max_commits=10):
+        """Get git history for entire file (more efficient than per-line)"""
+        if not self.git_available:
             return None
 
-        line_stripped = line_content.strip()
+        cache_key = f"{file_path}_{max_commits}"
+        if cache_key not in self.git_cache:
+            self.prefetch_git_history([file_path], max_commits)
+        return self.git_cache.get(cache_key)
+
+    def get_history_index(self, file_path):
+        """Inverted index from word tokens to the historical lines of one file
 
-        # Look through commits for a similar line without broken unicode
-        for commit_hash, changes in file_history.items():
-            for original_content in changes.values():
-                original_stripped = original_content.strip()
+        Returns (lines, token sets, token -> line ids); lines are (commit, line)
+        pairs from the cached git history, minus lines that are broken themselves.
+        """
+        if file_path in self.history_index:
+            return self.history_index[file_path]
 
-                # Skip if it has broken unicode too
-                if '�' in original_stripped or any(pattern in original_stripped for pattern in ['ğŸ', 'â']):
+        lines, token_sets, postings = [], [], {}
+        combined, _ = self.compile_patterns(self.default_patterns)
+        for commit_hash, changes in (self.get_file_git_history(file_path) or {}).items():
+            for original_content in changes.values():
+                if combined.search(original_content):
                     continue
+                tokens = set(self.word_pattern.findall(original_content))
+                if not tokens:
+                    continue
+                line_id = len(lines)
+                lines.append((commit_hash, original_content))
+                token_sets.append(tokens)
+                for token in tokens:
+                    postings.setdefault(token, []).append(line_id)
 
-                # Check if this could be the original version
-                # Simple heuristic: similar length and structure
-                if (abs(len(original_stripped) - len(line_stripped)) < 10 and
-                    any(word in original_stripped for word in line_stripped.split() if len(word) > 3)):
+        self.history_index[file_path] = (lines, token_sets, postings)
+        return self.history_index[file_path]
 
-                    return {
-                        'suggestion': original_stripped,
-                        'commit': commit_hash,
-                        'historical_line': original_content
-                    }
+    def get_git_suggestion_from_cache(self, file_path, line_content, top_k=5, min_ratio=0.6, max_candidates=64):
+        """Find the historical line a broken line most likely came from
 
-        return None
+        Candidates sharing word tokens with the broken line are ranked by token
+        Jaccard similarity; only the top_k are aligned with difflib, and the best
+        alignment must reach min_ratio.
+        """
+        cache_key = (str(file_path), line_content)
+        if cache_key in self.suggestion_cache:
+            return self.suggestion_cache[cache_key]
+
+        lines, token_sets, postings = self.get_history_index(file_path)
+        tokens = set(self.word_pattern.findall(line_content))
+
+        # Candidates come from the rarest tokens; a common token is only used when nothing rarer matched
+        candidates = set()
+        for token in sorted((token for token in tokens if token in postings), key=lambda token: len(postings[token])):
+            if candidates and len(candidates) + len(postings[token]) > max_candidates:
+                break
+            candidates.update(postings[token])
+
+        best = None
+        if candidates:
+            ranked = heapq.nlargest(top_k, candidates, key=lambda line_id: (
+                len(tokens & token_sets[line_id]) / len(tokens | token_sets[line_id]), -line_id))
+            for line_id in ranked:
+                matcher = difflib.SequenceMatcher(None, line_content, lines[line_id][1], autojunk=False)
+                ratio = matcher.ratio()
+                if ratio >= min_ratio and (best is None or ratio > best[0]):
+                    best = (ratio, line_id, matcher)
+
+        suggestion = None
+        if best:
+            ratio, line_id, matcher = best
+            commit_hash, historical_line = lines[line_id]
+            replacements = self.alignment_replacements(matcher)
+            if replacements:
+                suggestion = {
+                    'suggestion': {line_content[start:end]: text for start, end, text in replacements},
+                    'commit': commit_hash,
+                    'historical_line': historical_line,
+                    'similarity': round(ratio, 3),
+                    'replacements': replacements
+                }
+
+        self.suggestion_cache[cache_key] = suggestion
+        return suggestion
+
+    def alignment_replacements(self, matcher):
+        """(start, end, replacement) spans of the broken line that differ from the historical line
+
+        Only differences whose broken side contains non-ASCII text are kept:
+        those are the corrupted characters, anything else is an unrelated edit.
+        """
+        broken_line, good_line = matcher.a, matcher.b
+        replacements = []
+        for tag, a_start, a_end, b_start, b_end in matcher.get_opcodes():
+            if tag in ('replace', 'delete') and not broken_line[a_start:a_end].isascii():
+                replacements.append((a_start, a_end, good_line[b_start:b_end]))
+        return replacements
 
     def suggest_original_character(self, file_path, line_number, current_line):
-        """Suggest original character based on git history (now uses cached approach)"""
+        """Suggest original characters for a broken line from its git history"""
         if not self.git_available:
             return None
+        return self.get_git_suggestion_from_cache(file_path, current_line)
 
-        # Use the faster cached git history approach
-        suggestion = self.get_git_suggestion_from_cache(file_path, current_line)
-        if suggestion:
-            # Extract specific unicode suggestions from the full line
-            unicode_suggestion = self.extract_unicode_suggestion(current_line, suggestion['historical_line'])
-            if unicode_suggestion:
-                suggestion['suggestion'] = unicode_suggestion
-            return suggestion
+    def build_mojibake_tables(self):
+        """Precompute the tables of the mojibake reversal engine
 
-        return None
+        UTF-8 read through a single-byte codec turns every byte into one
+        character. mojibake_bytes maps each such character back to its byte for
+        cp1252, latin-1 and cp1254 at once (their characters never collide), and
+        the UTF-8 class of that byte (lead of 2/3/4, continuation) decides which
+        runs of characters can be a mis-decoded sequence at all.
+        """
+        self.mojibake_bytes = {}  # Character -> the byte it was decoded from
+        self.mojibake_codecs = {}  # Character -> codecs that decode some byte to it
+        for encoding in self.mojibake_encodings:
+            for byte in range(0x80, 0x100):
+                try:
+                    char = bytes([byte]).decode(encoding)
+                except UnicodeDecodeError:
+                    continue
+                self.mojibake_bytes[char] = byte
+                self.mojibake_codecs.setdefault(char, set()).add(encoding)
+        # Lenient decoders pass the bytes a codec leaves undefined through as C1 controls
+        for byte in range(0x80, 0xA0):
+            self.mojibake_bytes[chr(byte)] = byte
+            self.mojibake_codecs[chr(byte)] = set(self.mojibake_encodings)
+        self.closing_quotes = set('\u2019\u201d\u00bb\u203a')
+
+        def byte_class(byte):
+            if 0x80 <= byte <= 0xBF:
+                return 'cont'
+            if 0xC2 <= byte <= 0xDF:
+                return 'lead2'
+            if 0xE0 <= byte <= 0xEF:
+                return 'lead3'
+            if 0xF0 <= byte <= 0xF4:
+                return 'lead4'
+            return 'invalid'  # 0xC0, 0xC1 and 0xF5+ never start valid UTF-8
+
+        classes = {}
+        for char, byte in sorted(self.mojibake_bytes.items(), key=lambda item: item[1]):
+            classes.setdefault(byte_class(byte), []).append(char)
+
+        def char_class(name):
+            return '[' + ''.join(re.escape(char) for char in classes[name]) + ']'
+
+        def byte_alternation(*names):
+            # UTF-8 encodings grouped by their leading bytes, so every branch starts with a literal
+            groups = {}
+            for char in (char for name in names for char in classes[name]):
+                encoded = char.encode('utf-8')
+                groups.setdefault(encoded[:-1], []).append(encoded[-1:])
+            return b'(?:' + b'|'.join(re.escape(prefix) + b'[' + b''.join(map(re.escape, last_bytes)) + b']'
+                                      for prefix, last_bytes in groups.items()) + b')'
+
+        # Both regexes open with one set of every lead, which lets the regex engine skip
+        # ahead to candidates; lookbehinds then pick the number of continuations
+        cont, lead2, lead3, lead4 = (char_class(name) for name in ('cont', 'lead2', 'lead3', 'lead4'))
+        leads = f'[{lead2[1:-1]}{lead3[1:-1]}{lead4[1:-1]}]'
+        sequence = f'{lead2}{cont}|{lead3}{cont}{{2}}|{lead4}{cont}{{3}}'
+        self.mojibake_segment = re.compile(
+            f'{leads}(?:(?<={lead2}){cont}|(?<={lead3}){cont}{{2}}|(?<={lead4}){cont}{{3}})(?:{sequence})*')
+        self.mojibake_pair = re.compile(f'{leads}{cont}')
+        self.mojibake_translation = str.maketrans({char: chr(byte) for char, byte in self.mojibake_bytes.items()})
+
+        # The same sequence shapes over raw UTF-8, so the byte-level fast path stays exact;
+        # every lead character encodes to two bytes, which keeps the lookbehinds fixed-width
+        byte_cont = byte_alternation('cont')
+        byte_lead2, byte_lead3, byte_lead4 = (byte_alternation(name) for name in ('lead2', 'lead3', 'lead4'))
+        self.mojibake_prefilter = re.compile(
+            byte_alternation('lead2', 'lead3', 'lead4') + b'(?:' +
+            b'(?<=' + byte_lead2 + b')' + byte_cont + b'|' +
+            b'(?<=' + byte_lead3 + b')' + byte_cont + b'{2}|' +
+            b'(?<=' + byte_lead4 + b')' + byte_cont + b'{3})')
+
+    def letter_script(self, char):
+        """Script of a letter from its Unicode name, with the scripts Japanese and Korean mix folded together"""
+        script = self.script_cache.get(char)
+        if script is None:
+            script = unicodedata.name(char, '').split(' ')[0]
+            if script in ('HIRAGANA', 'KATAKANA', 'HANGUL'):
+                script = 'CJK'
+            self.script_cache[char] = script
+        return script
+
+    def mojibake_score(self, text):
+        """How much text looks like mis-decoded UTF-8
+
+        One point per lead/continuation character pair, per control, unassigned
+        or private-use character, per IPA, spacing modifier, Syriac, Thaana or
+        NKo character, per combining mark that follows no letter of its script
+        and per script change between adjacent letters.
+        """
+        score = len(self.mojibake_pair.findall(text))
+        previous_script = None
+        previous_is_letter = False
+        for char in text:
+            if char < '\x80':
+                is_letter = char.isalpha()
+                if is_letter and previous_script not in (None, 'LATIN'):
+                    score += 1
+                previous_script = 'LATIN' if is_letter else None
+                previous_is_letter = is_letter
+                continue
+            category = unicodedata.category(char)
+            if category in ('Cc', 'Cn', 'Co', 'Cs') or 0x250 <= ord(char) < 0x300:
+                score += 1
+            elif category == 'Mn' and not (previous_is_letter and self.letter_script(char) in ('COMBINING',
+                                                                                          previous_script)):
+                score += 1  # A mark with no letter, or from another script than its letter
+            if 0x700 <= ord(char) < 0x800:
+                score += 1  # Syriac, Thaana and NKo: where stray two-byte sequences land
+            is_letter = category[0] == 'L'
+            if is_letter:
+                script = self.letter_script(char)
+                if previous_script is not None and script != previous_script:
+                    score += 1
+                previous_script = script
+            else:
+                previous_script = None
+            previous_is_letter = is_letter
+        return score
+
+    def reverse_segment(self, segment):
+        """Bytes behind a candidate run, decoded as UTF-8; None when they are not valid UTF-8"""
+        try:
+            return segment.translate(self.mojibake_translation).encode('latin-1').decode('utf-8')
+        except UnicodeError:
+            return None
 
-    def extract_unicode_suggestion(self, broken_line, good_line):
-        """Extract unicode character suggestions by comparing lines"""
-        # Simple approach: find positions where broken_line has � and good_line has unicode
-        suggestions = {}
-
-        # Convert both lines to lists for character-by-character comparison
-        broken_chars = list(broken_line)
-        good_chars = list(good_line)
-
-        # Try to align and find replacements
-        min_len = min(len(broken_chars), len(good_chars))
-
-        for i in range(min_len):
-            if broken_chars[i] == '��' and good_chars[i] != '�':
-                # Found a potential replacement
-                suggestions[i] = good_chars[i]
-
-        # Also check for common patterns
-        broken_patterns = ['�', '��', '�����']
-        for pattern in broken_patterns:
-            if pattern in broken_line and pattern not in good_line:
-                # Try to find what this pattern corresponds to in good_line
-                broken_pos = broken_line.find(pattern)
-                if broken_pos >= 0 and broken_pos < len(good_line):
-                    # Look for unicode characters around this position in good_line
-                    for j in range(max(0, broken_pos-2), min(len(good_line), broken_pos+3)):
-                        char = good_line[j]
-                        if ord(char) > 127:  # Non-ASCII character (likely emoji/unicode)
-                            suggestions[pattern] = char
-                            break
+    def segment_encoding(self, segment):
+        """The codec that could have produced every character of a run, None if no single one could"""
+        codecs_left = set(self.mojibake_encodings)
+        for char in set(segment):
+            codecs_left &= self.mojibake_codecs[char]
+        if 'latin-1' in codecs_left and any('\x80' <= char < '\xa0' for char in segment):
+            return 'latin-1'
+        return next((encoding for encoding in self.mojibake_encodings if encoding in codecs_left), None)
+
+    def find_mojibake(self, text):
+        """Reversible mojibake runs in text as (start, end, restored, encoding, rounds)"""
+        found = []
+        for match in self.mojibake_segment.finditer(text):
+            start, end = match.span()
+            key = (text[start - 1:start], match.group(), text[end:end + 1])
+            reversal = self.reversal_cache.get(key)
+            if reversal is None:
+                reversal = self.reversal_cache[key] = self.reverse_run(*key)
+                if len(self.reversal_cache) > self.reversal_cache_size:
+                    self.reversal_cache.popitem(last=False)
+            else:
+                self.reversal_cache.move_to_end(key)
+            if reversal:
+                found.append((start, end) + reversal)
+        return found
+
+    def reverse_run(self, left, run, right):
+        """(restored, encoding, rounds) for one candidate run between its neighbouring characters, or ()
+
+        A run is only reversed when its bytes are valid UTF-8 and the result,
+        with one character of context on each side, scores lower than the
+        original. Runs encoded more than once are reversed while the bytes stay
+        valid UTF-8, and the lowest-scoring round wins: an intermediate round
+        can look worse than the original (a dagger turning into a modifier).
+        """
+        encoding = self.segment_encoding(run)
+        if encoding is None:
+            return ()
+        best = (self.mojibake_score(left + run + right), run, 0)
+        current = run
+        rounds = 0
+        while rounds < 3 and self.mojibake_segment.fullmatch(current):
+            restored = self.reverse_segment(current)
+            if restored is None:
+                break
+            # "IRMÃ”" is as likely an uppercase word before a closing quote as a mis-decoded "Ô"
+            if len(current) == 2 and current[1] in self.closing_quotes and restored.isalpha() \
+                    and left.isupper() and not right.isalpha():
+                break
+            current = restored
+            rounds += 1
+            score = self.mojibake_score(left + current + right)
+            if score < best[0]:
+                best = (score, current, rounds)
+        _, restored, rounds = best
+        return (restored, encoding, rounds) if rounds else ()
+
+    def reversal_for_span(self, original, offset, found):
+        """Reversal record for the text original starting at offset, given mojibake runs that fall inside it"""
+        pieces = []
+        position = 0
+        for start, end, restored, _, _ in found:
+            pieces.append(original[position:start - offset])
+            pieces.append(restored)
+            position = end - offset
+        pieces.append(original[position:])
+        # A lone two-byte sequence is the only shape legitimate text produces now and then
+        lone_pair = len(found) == 1 and found[0][4] == 1 and found[0][1] - found[0][0] == 2
+        return {
+            'original': original,
+            'restored': ''.join(pieces),
+            'method': f'encoding_reversal_{found[0][3]}',
+            'confidence': 'medium' if lone_pair else 'high'
+        }
 
-        return suggestions if suggestions else None
+    def file_id(self, file_path):
+        """Index of a file in file_table, added on first use"""
+        file_path = str(file_path)
+        if file_path not in self.file_ids:
+            self.file_ids[file_path] = len(self.file_table)
+            self.file_table.append(file_path)
+        return self.file_ids[file_path]
+
+    def pattern_id(self, pattern):
+        """Index of a pattern in pattern_table, added on first use"""
+        if pattern not in self.pattern_ids:
+            self.pattern_ids[pattern] = len(self.pattern_table)
+            self.pattern_table.append(pattern)
+        return self.pattern_ids[pattern]
+
+    def decode_text(self, raw_data, encoding):
+        """Decode like open(..., 'r', errors='replace'), including universal newline translation"""
+        content = codecs.decode(raw_data, encoding, errors='replace')
+        return content.replace('\r\n', '\n').replace('\r', '\n')
+
+    def read_lines(self, file_results):
+        """Lines of a scanned file, decoded again with the encoding its scan used"""
+        try:
+            raw_data = self.read_bytes(file_results['file'])
+        except OSError:
+            return []
+        return self.decode_text(raw_data, file_results['encoding_used'] or 'utf-8').split('\n')
 
-    def try_encoding_reversal(self, corrupted_text, encoding='windows-1254'):
-        """Try to reverse encoding corruption by re-encoding and decoding"""
+    def read_bytes(self, file_path):
+        """Whole file as bytes"""
+        with open(file_path, 'rb') as f:
+            return f.read()
+
+    def detect_encoding(self, file_path, raw_data=None):
+        """Detect file encoding in tiers, cheapest first, memoized per (path, mtime, size)
+
+        1. byte order mark (UTF-8 / UTF-16 / UTF-32)
+        2. strict UTF-8 decode
+        3. charset-normalizer, only for files that are not valid UTF-8
+        4. chardet, when charset-normalizer has no answer
+
+        raw_data, when the caller already read the file, avoids a second read.
+        """
         try:
-            # Check if the corrupted text contains replacement characters
-            if '�' in corrupted_text:
-                return None  # Cannot reverse if data was lost
+            stat = os.stat(file_path)
+            cache_key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+            if cache_key in self.encoding_cache:
+                return self.encoding_cache[cache_key]
+
+            if raw_data is None:
+                raw_data = self.read_bytes(file_path)
+            encoding_info = self.detect_encoding_tiered(raw_data)
+        except Exception as e:
+            return {'encoding': None, 'confidence': 0, 'error': str(e), 'method': 'error'}
 
-            # Encode the corrupted text back to bytes using the suspected wrong encoding
-            wrong_encoding_bytes = corrupted_text.encode(encoding, errors='strict')
+        self.encoding_tiers[encoding_info.get('method', 'unknown')] += 1
+        self.encoding_cache[cache_key] = encoding_info
+        return encoding_info
 
-            # Decode as UTF-8 to get the original
-            restored = wrong_encoding_bytes.decode('utf-8', errors='strict')
+    def detect_encoding_tiered(self, raw_data):
+        """Run the detection tiers over the raw bytes of a file"""
+        # Tier 1: byte order marks (UTF-32 first, its LE mark starts with the UTF-16 one)
+        for bom, encoding in self.byte_order_marks:
+            if raw_data.startswith(bom):
+                return {'encoding': encoding, 'confidence': 1.0, 'language': '', 'method': 'bom'}
+
+        # Tier 2: most source files are plain UTF-8
+        try:
+            raw_data.decode('utf-8')
+            return {'encoding': 'utf-8', 'confidence': 1.0, 'language': '', 'method': 'utf-8-strict'}
+        except UnicodeDecodeError:
+            pass
 
-            # Verify this looks like a valid restoration (contains emoji/unicode)
-            if any(ord(c) > 127 for c in restored):
+        # Tier 3: charset-normalizer (more accurate than chardet, especially for Windows-1252)
+        try:
+            best_match = from_bytes(raw_data).best()
+            if best_match:
                 return {
-                    'restored': restored,
-                    'method': f'encoding_reversal_{encoding}',
-                    'confidence': 'high' if len(restored) < len(corrupted_text) else 'medium'
+                    'encoding': best_match.encoding,
+                    'confidence': 1.0 - best_match.chaos,  # Convert chaos to confidence (lower chaos = higher confidence)
+                    'language': getattr(best_match, 'language', ''),
+                    'method': 'charset-normalizer'
                 }
-
-            return None
-
         except Exception:
-            return None
+            pass  # Fall back to chardet
+
+        # Tier 4: chardet on the first 10KB
+        result = chardet.detect(raw_data[:10000]) or {'encoding': None, 'confidence': 0}
+        result['method'] = 'chardet'
+        return result
+
+    def compile_patterns(self, patterns):
+        """Compile a pattern list into one alternation, longest patterns first
+
+        Python alternation is leftmost-first, so ordering the branches by their
+        maximum match width makes the longest pattern win at each position and
+        replaces per-pattern scanning plus overlap deduplication. Branches are
+        not named groups: those disable the engine's leading-character prefilter
+        and make the scan an order of magnitude slower, so the matching branch is
+        identified afterwards, only for actual hits: like the per-pattern scan
+        did, the earliest pattern in list order that matches the same span wins.
+        """
+        key = tuple(patterns)
+        if key not in self.compiled_patterns:
+            def width(pattern):
+                try:
+                    low, high = sre_parse.parse(pattern).getwidth()
+                except Exception:
+                    low = high = len(pattern)
+                return (-high, -low)
+
+            unique = list(dict.fromkeys(patterns))
+            ordered = sorted(unique, key=width)
+            combined = re.compile('|'.join(f'(?:{pattern})' for pattern in ordered), re.MULTILINE)
+            self.compiled_patterns[key] = (combined, [(pattern, re.compile(pattern, re.MULTILINE))
+                                                      for pattern in unique])
+        return self.compiled_patterns[key]
+
+    def build_line_index(self, content):
+        """Offsets at which each line of content starts"""
+        line_starts = [0]
+        position = content.find('\n')
+        while position != -1:
+            line_starts.append(position + 1)
+            position = content.find('\n', position + 1)
+        return line_starts
+
+    def read_head(self, file_path):
+        """First sniff_size bytes of a file and its total size, from one bounded read"""
+        with open(file_path, 'rb') as f:
+            return f.read(self.sniff_size), os.fstat(f.fileno()).st_size
+
+    def looks_binary(self, head):
+        """Content sniffing on the head of a file: magic numbers, NUL bytes, control-byte ratio"""
+        if not head:
+            return False
+        if any(head.startswith(bom) for bom, _ in self.byte_order_marks):
+            return False  # UTF-16/32 text legitimately contains NUL bytes
+        if self.binary_magic_numbers.match(head):
+            return True
+        if b'\x00' in head:
+            return True
+        control_bytes = len(head) - len(head.translate(None, self.control_bytes))
+        return control_bytes / len(head) > 0.3
 
-    def detect_encoding(self, file_path):
-        """Detect file encoding using charset-normalizer with chardet fallback"""
-        try:
-            # Try charset-normalizer first (more accurate, especially for UTF-8 vs Windows-1252)
+    def is_clean_utf8(self, file_path, head=None, size=None, chunk_size=1 << 20):
+        """Byte-level check: valid UTF-8 and none of the fast-path needles occur
+
+        The file is memory-mapped and searched as raw bytes, so a clean file is
+        passed without decoding it into a str or splitting it into lines. Files
+        that fit in the already-read head are checked from that buffer.
+        """
+        if head is not None and size is not None and size <= len(head):
+            if any(needle in head for needle in self.fast_path_needles):
+                return False
+            if self.reverse_mojibake and self.mojibake_prefilter.search(head):
+                return False
             try:
-                results = from_path(file_path)
-                if results.best():
-                    best_match = results.best()
-                    return {
-                        'encoding': best_match.encoding,
-                        'confidence': 1.0 - best_match.chaos,  # Convert chaos to confidence (lower chaos = higher confidence)
-                        'language': getattr(best_match, 'language', ''),
-                        'method': 'charset-normalizer'
-                    }
-            except Exception:
-                pass  # Fall back to chardet
+                head.decode('utf-8')
+                return True
+            except UnicodeDecodeError:
+                return False
 
-            # Fallback to chardet if charset-normalizer fails
+        try:
             with open(file_path, 'rb') as f:
-                raw_data = f.read(10000)  # Read first 10KB
-                result = chardet.detect(raw_data)
-
-                # For code files, prefer UTF-8 if chardet confidence is low
-                if result and result.get('confidence', 0) < 0.93:
-                    file_ext = str(file_path).lower().split('.')[-1] if '.' in str(file_path) else ''
-                    code_extensions = {'py', 'js', 'jsx', 'ts', 'tsx', 'md', 'json', 'css', 'scss', 'html', 'xml', 'yml', 'yaml'}
-
-                    if file_ext in code_extensions:
-                        # Try UTF-8 first for code files
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as test_f:
-                                test_f.read()  # If this succeeds, UTF-8 is valid
-                            return {'encoding': 'utf-8', 'confidence': 0.95, 'language': '', 'chardet_result': result, 'method': 'utf-8-fallback'}
-                        except UnicodeDecodeError:
-                            pass  # Fall back to chardet result
-
-                if result:
-                    result['method'] = 'chardet'
-                return result
-        except Exception as e:
-            return {'encoding': None, 'confidence': 0, 'error': str(e), 'method': 'error'}
+                if os.fstat(f.fileno()).st_size == 0:
+                    return True
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if any(mm.find(needle) != -1 for needle in self.fast_path_needles):
+                        return False
+                    if self.reverse_mojibake and self.mojibake_prefilter.search(mm):
+                        return False
+
+                    decoder = codecs.getincrementaldecoder('utf-8')('strict')
+                    for offset in range(0, len(mm), chunk_size):
+                        chunk = mm[offset:offset + chunk_size]
+                        if not chunk.isascii():
+                            decoder.decode(chunk)
+                        elif decoder.getstate()[0]:
+                            return False  # Multi-byte sequence cut off by ASCII
+                    decoder.decode(b'', final=True)
+                    return True
+        except (OSError, ValueError, UnicodeDecodeError):
+            return False
 
     def search_file(self, file_path, patterns=None, check_encoding=True, enable_git_history=True):
         """Search a single file for broken unicode"""
@@ -300,22 +869,48 @@ class BrokenUnicodeSearcher:
         file_results = {
             'file': str(file_path),
             'issues': [],
+            'warnings': [],
             'encoding_info': None,
+            'encoding_used': None,
             'line_count': 0,
             'errors': []
         }
 
+        # One bounded read feeds binary sniffing, the fast path and (for small files) everything else
+        try:
+            head, size = self.read_head(file_path)
+        except OSError as e:
+            file_results['errors'].append(f"Could not read file: {e}")
+            return file_results
+        if self.looks_binary(head):
+            self.encoding_tiers['binary'] += 1
+            file_results['binary'] = True
+            return file_results
+
+        # Fast path: clean UTF-8 files never reach encoding detection, decoding or regex
+        if set(patterns) <= set(self.default_patterns) and self.is_clean_utf8(file_path, head, size):
+            self.encoding_tiers['byte-scan'] += 1
+            file_results['line_count'] = None
+            if check_encoding:
+                file_results['encoding_info'] = {'encoding': 'utf-8', 'confidence': 1.0, 'language': '',
+                                                 'method': 'byte-scan'}
+            return file_results
+
+        try:
+            raw_data = head if size <= len(head) else self.read_bytes(file_path)
+        except OSError as e:
+            file_results['errors'].append(f"Could not read file: {e}")
+            return file_results
+
         # Check encoding
         if check_encoding:
-            encoding_info = self.detect_encoding(file_path)
+            encoding_info = self.detect_encoding(file_path, raw_data)
             file_results['encoding_info'] = encoding_info
 
             # Warn about low confidence encoding detection
             if encoding_info.get('confidence', 0) < 0.7:
-                file_results['issues'].append({
-                    'type': 'encoding_uncertainty',
-                    'message': f"Low confidence encoding detection: {encoding_info.get('encoding')} ({encoding_info.get('confidence', 0):.2f})"
-                })
+                file_results['warnings'].append(
+                    f"Low confidence encoding detection: {encoding_info.get('encoding')} ({encoding_info.get('confidence', 0):.2f})")
 
         # Try multiple encodings to read the file
         encodings_to_try = ['utf-8', 'latin1', 'cp1252', 'iso-8859-1']
@@ -329,10 +924,9 @@ class BrokenUnicodeSearcher:
 
         for encoding in encodings_to_try:
             try:
-                with open(file_path, 'r', encoding=encoding, errors='replace') as f:
-                    content = f.read()
-                    used_encoding = encoding
-                    break
+                content = self.decode_text(raw_data, encoding)
+                used_encoding = encoding
+                break
             except Exception as e:
                 file_results['errors'].append(f"Failed to read with {encoding}: {e}")
                 continue
@@ -340,69 +934,240 @@ class BrokenUnicodeSearcher:
         if content is None:
             file_results['errors'].append("Could not read file with any encoding")
             return file_results
+        file_results['encoding_used'] = used_encoding
 
-        # Search for patterns
-        lines = content.split('\n')
-        file_results['line_count'] = len(lines)
-
-        for line_num, line in enumerate(lines, 1):
-            # Collect all matches first to deduplicate overlapping patterns
-            all_matches = []
-            for pattern in patterns:
-                matches = re.finditer(pattern, line)
-                for match in matches:
-                    all_matches.append({
-                        'pattern': pattern,
-                        'start': match.start(),
-                        'end': match.end(),
-                        'match': match.group(),
-                        'line_num': line_num,
-                        'line_content': line
-                    })
-
-            # Sort by start position, then by length (longest first) to prioritize longer matches
-            all_matches.sort(key=lambda x: (x['start'], -(x['end'] - x['start'])))
-
-            # Deduplicate overlapping matches, keeping only the longest match at each position
-            deduplicated_matches = []
-            used_positions = set()
-
-            for match_info in all_matches:
-                start, end = match_info['start'], match_info['end']
-                # Check if this match overlaps with any already used position
-                if not any(pos in used_positions for pos in range(start, end)):
-                    deduplicated_matches.append(match_info)
-                    used_positions.update(range(start, end))
-
-            # Convert deduplicated matches to issues
-            for match_info in deduplicated_matches:
-                issue = {
-                    'type': 'broken_unicode',
-                    'pattern': match_info['pattern'],
-                    'line': match_info['line_num'],
-                    'column': match_info['start'] + 1,
-                    'context': match_info['line_content'].strip(),
-                    'match': match_info['match'],
-                    'encoding_used': used_encoding
-                }
+        # Search the whole text with one combined regex; matches never overlap
+        combined, listed_patterns = self.compile_patterns(patterns)
+        line_starts = self.build_line_index(content)
+        file_results['line_count'] = len(line_starts)
+        file_id = self.file_id(file_path)
 
-                # Try encoding reversal first (faster)
-                # Disabled: Windows-1254 reversal causes false positives on normal unicode text
-                # reversal = self.try_encoding_reversal(match.group())
-                # if reversal:
-                #     issue['encoding_reversal'] = reversal
-
-                # Try git history suggestion when enabled
-                if enable_git_history and self.git_available:
-                    suggestion = self.suggest_original_character(file_path, match_info['line_num'], match_info['line_content'])
-                    if suggestion:
-                        issue['git_suggestion'] = suggestion
+        # Reversible mojibake anywhere in the text; runs no pattern matched become issues of their own
+        mojibake = self.find_mojibake(content) if self.reverse_mojibake else []
+        mojibake_starts = [run[0] for run in mojibake]
+        covered = set()
 
+        for match in combined.finditer(content):
+            if match.start() == match.end():
+                continue
+            line_index = bisect_right(line_starts, match.start()) - 1
+            # Of the patterns matching this exact span, the first one listed is reported
+            pattern = match.re.pattern
+            for candidate, compiled in listed_patterns:
+                found = compiled.match(content, match.start())
+                if found and found.end() == match.end():
+                    pattern = candidate
+                    break
+            issue = IssueRecord(file_id, line_index + 1, match.start() - line_starts[line_index] + 1,
+                                match.end() - match.start(), self.pattern_id(pattern))
+
+            if mojibake:
+                first = bisect_left(mojibake_starts, match.start())
+                last = bisect_left(mojibake_starts, match.end())
+                inside = [run for run in mojibake[first:last] if run[1] <= match.end()]
+                if inside:
+                    issue.encoding_reversal = self.reversal_for_span(match.group(), match.start(), inside)
+                # Runs touching a pattern match are never reported a second time
+                covered.update(range(first, last))
+                if first and mojibake[first - 1][1] > match.start():
+                    covered.add(first - 1)
+
+            file_results['issues'].append(issue)
+
+        if len(covered) < len(mojibake):
+            for index, run in enumerate(mojibake):
+                if index in covered:
+                    continue
+                start, end, _, encoding, _ = run
+                reversal = self.reversal_for_span(content[start:end], start, [run])
+                # A lone two-character run is as often legitimate text ("“Ñ”", "É€") and is never reported alone
+                if reversal['confidence'] != 'high':
+                    continue
+                line_index = bisect_right(line_starts, start) - 1
+                issue = IssueRecord(file_id, line_index + 1, start - line_starts[line_index] + 1, end - start,
+                                    self.pattern_id(f'mojibake:{encoding}'))
+                issue.encoding_reversal = reversal
                 file_results['issues'].append(issue)
+            file_results['issues'].sort(key=lambda issue: (issue.line, issue.column))
+
+        # Try git history suggestions when enabled
+        if enable_git_history and self.git_available and file_results['issues']:
+            lines = content.split('\n')
+            if self.provenance:
+                self.add_provenance(file_results, lines)
+            self.add_git_suggestions(file_results, lines)
 
         return file_results
 
-    def search_directory(self, directory, recursive=True, extensions=None, enable_git_history=True):
+    def add_git_suggestions(self, file_results, lines=None):
+        """Attach git history suggestions to the broken unicode issues of one scanned file"""
+        issues = [issue for issue in file_results['issues'] if issue.git_suggestion is None]
+        if not issues:
+            return
+        if lines is None:
+            lines = self.read_lines(file_results)
+        for issue in issues:
+            if issue.line > len(lines):
+                continue
+            suggestion = self.suggest_original_character(file_results['file'], issue.line, lines[issue.line - 1])
+            if suggestion:
+                self.attach_suggestion(issue, suggestion)
+
+    def attach_suggestion(self, issue, suggestion):
+        """Store a line-level suggestion on an issue, with the aligned spans overlapping the issue's own span
+
+        The spans are kept as (start, end, text) relative to the match, so that
+        suggested_replacement can splice them into it. A span reaching outside
+        the match cannot be split, and leaves the suggestion without pieces.
+        """
+        start = issue.column - 1
+        end = start + issue.length
+        pieces = [(span_start - start, span_end - start, text) for span_start, span_end, text
+                  in suggestion['replacements'] if span_start < end and start < span_end]
+        if pieces and all(piece_start >= 0 and piece_end <= issue.length for piece_start, piece_end, _ in pieces):
+            suggestion = dict(suggestion, pieces=pieces)
+        issue.git_suggestion = suggestion
+
+    def suggested_replacement(self, issue, match):
+        """The issue's match with the git suggestion's aligned spans spliced in, None without aligned spans"""
+        suggestion = issue.git_suggestion
+        if suggestion is None or not suggestion.get('pieces'):
+            return None
+        parts = []
+        position = 0
+        for piece_start, piece_end, text in sorted(suggestion['pieces']):
+            parts.append(match[position:piece_start])
+            parts.append(text)
+            position = piece_end
+        parts.append(match[position:])
+        return ''.join(parts)
+
+    def blame_lines(self, relative_path, line_numbers, max_ranges=500):
+        """Run one `git blame --porcelain` for the given lines: {line number: blame entry}"""
+        ranges = []
+        for line_number in sorted(set(line_numbers)):
+            if ranges and ranges[-1][1] == line_number - 1:
+                ranges[-1][1] = line_number
+            else:
+                ranges.append([line_number, line_number])
+        cmd = ['git', 'blame', '--porcelain']
+        if len(ranges) <= max_ranges:
+            for first, last in ranges:
+                cmd += ['-L', f'{first},{last}']
+        cmd += ['--', relative_path]
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, cwd=self.git_toplevel())
+        except OSError:
+            return {}
+        if result.returncode != 0:
+            return {}
+
+        commits = {}
+        entries = {}
+        entry = None
+        for raw_line in result.stdout.decode('utf-8', errors='replace').split('\n'):
+            if raw_line.startswith('\t'):
+                if entry:
+                    metadata = commits[entry['commit']]
+                    entry.update(author=metadata.get('author', ''), summary=metadata.get('summary', ''),
+                                 time=metadata.get('author-time'), previous=metadata.get('previous'))
+                    entry.setdefault('filename', metadata.get('filename', relative_path))
+                    entries[entry['final_line']] = entry
+                entry = None
+                continue
+            fields = raw_line.split(' ')
+            if entry is None and len(fields) >= 3 and len(fields[0]) == 40:
+                entry = {'commit': fields[0], 'orig_line': int(fields[1]), 'final_line': int(fields[2])}
+                commits.setdefault(fields[0], {})
+            elif entry is not None:
+                key, _, value = raw_line.partition(' ')
+                commits[entry['commit']][key] = value
+                if key == 'filename':
+                    entry['filename'] = value
+        return entries
+
+    def map_line_to_parent(self, lines, parent_lines, index, cache_key):
+        """Index of the parent-version line that lines[index] replaced, None if it was purely added
+
+        cache_key names the two versions, (commit, path, parent commit, parent path).
+        """
+        opcodes = self.line_mapping_cache.get(cache_key)
+        if opcodes is None:
+            opcodes = difflib.SequenceMatcher(None, lines, parent_lines, autojunk=False).get_opcodes()
+            self.line_mapping_cache[cache_key] = opcodes
+            if len(self.line_mapping_cache) > self.line_mapping_cache_size:
+                self.line_mapping_cache.popitem(last=False)
+        else:
+            self.line_mapping_cache.move_to_end(cache_key)
+        for tag, a_start, a_end, b_start, b_end in opcodes:
+            if a_start <= index < a_end:
+                if tag == 'equal':
+                    return b_start + (index - a_start)
+                if tag == 'replace':
+                    return min(b_start + (index - a_start), b_end - 1)
+                return None
+        return None
+
+    def add_provenance(self, file_results, working_lines=None):
+        """Find the commit that introduced each corrupted line and its original text in that commit's parent
+
+        One `git blame --porcelain` covers every flagged line of the file; the
+        original comes from the parent blob, read through the cat-file process.
+        """
+        issues = file_results['issues']
+        relative_path = self.git_relative_path(file_results['file'])
+        if not issues or relative_path is None:
+            return
+
+        if working_lines is None:
+            working_lines = self.read_lines(file_results)
+        blame = self.blame_lines(relative_path, [issue.line for issue in issues])
+        for issue in issues:
+            entry = blame.get(issue.line)
+            if not entry or issue.line > len(working_lines):
+                continue
+            line_content = working_lines[issue.line - 1]
+            uncommitted = set(entry['commit']) == {'0'}
+            issue.provenance = {
+                'commit': 'uncommitted' if uncommitted else entry['commit'][:8],
+                'author': entry['author'],
+                'date': datetime.fromtimestamp(int(entry['time'])).strftime('%Y-%m-%d') if entry['time'] else '',
+                'summary': 'uncommitted changes' if uncommitted else entry['summary'],
+            }
+            if not entry['previous']:
+                continue  # Root commit: the line was born corrupted
+
+            parent_commit, _, parent_path = entry['previous'].partition(' ')
+            if uncommitted:
+                lines = working_lines
+            else:
+                lines = self.read_git_blob(entry['commit'], entry['filename'])
+            parent_lines = self.read_git_blob(parent_commit, parent_path)
+            if not lines or not parent_lines:
+                continue
+
+            parent_index = self.map_line_to_parent(lines, parent_lines, entry['orig_line'] - 1,
+                                                   (entry['commit'], entry['filename'], parent_commit, parent_path))
+            if parent_index is None:
+                continue
+            original = parent_lines[parent_index]
+            issue.provenance['parent'] = parent_commit[:8]
+            issue.provenance['original_line'] = original
+
+            matcher = difflib.SequenceMatcher(None, line_content, original, autojunk=False)
+            replacements = self.alignment_replacements(matcher)
+            if replacements:
+                self.attach_suggestion(issue, {
+                    'suggestion': {line_content[start:end]: text for start, end, text in replacements},
+                    'commit': parent_commit[:8],
+                    'historical_line': original,
+                    'similarity': round(matcher.ratio(), 3),
+                    'replacements': replacements,
+                    'method': 'blame'
+                })
+
+    def search_directory(self, directory, recursive=True, extensions=None, enable_git_history=True, jobs=1):
         """Search directory for files with broken unicode"""
         if extensions is None:
             extensions = self.default_extensions
@@ -416,43 +1181,255 @@ class BrokenUnicodeSearcher:
         if recursive:
             print("📁 Recursive search enabled")
 
-        pattern = "**/*" if recursive else "*"
-
         # First pass: collect all files to check
         files_to_check = []
-        files_found = 0
+        discovered, method = self.discover_files(directory, recursive)
 
-        for file_path in directory.glob(pattern):
-            if file_path.is_file():
-                files_found += 1
+        for file_path in discovered:
+            # Check extension
+            if extensions and file_path.suffix.lower() not in extensions:
+                continue
 
-                # Skip files in excluded directories
-                excluded_dirs = {'node_modules', 'build', '.meteor', 'archive'}
-                if any(excluded_dir in file_path.parts for excluded_dir in excluded_dirs):
-                    continue
+            # Skip binary files and common non-text files
+            if self.is_likely_binary(file_path):
+                continue
 
-                # Check extension
-                if extensions and file_path.suffix.lower() not in extensions:
-                    continue
+            files_to_check.append(file_path)
+
+        # Deterministic report order regardless of walk order or worker scheduling
+        files_to_check.sort()
+        print(f"📊 Found {len(discovered)} files via {method}, will check {len(files_to_check)}")
+
+        # Files unchanged since a cached run are not read at all
+        cached = {}
+        if self.scan_cache is not None:
+            options = self.scan_options_digest(enable_git_history)
+            for file_path in files_to_check:
+                result = self.cached_result(file_path, options)
+                if result is not None:
+                    cached[file_path] = result
+        files_to_scan = [file_path for file_path in files_to_check if file_path not in cached]
+
+        # Second pass: check files with progress bar; git history is batched afterwards
+        if files_to_scan and jobs > 1 and len(files_to_scan) > 1:
+            scanned = self.search_files_parallel(files_to_scan, jobs)
+        else:
+            scanned = []
+            with tqdm(files_to_scan, desc="🔍 Scanning files", disable=len(files_to_scan) < 5) as pbar:
+                for file_path in pbar:
+                    pbar.set_postfix_str(str(file_path.name))
+                    scanned.append(self.search_file(file_path, enable_git_history=False))
+        scanned = dict(zip(files_to_scan, scanned))
+
+        fresh_results = []
+        for file_path in files_to_check:
+            result = cached.get(file_path) or scanned[file_path]
+            if result['issues'] or result['warnings'] or result['errors']:
+                self.results.append(result)
+                if file_path in scanned:
+                    fresh_results.append(result)
+
+        if enable_git_history and self.git_available and fresh_results:
+            flagged = [result for result in fresh_results if result['issues']]
+            if self.provenance:
+                for result in tqdm(flagged, desc="🧬 Blame", disable=len(flagged) < 5):
+                    self.add_provenance(result)
+            # History is only needed where blame did not already find the original
+            unresolved = [result for result in flagged if any(
+                issue.git_suggestion is None for issue in result['issues'])]
+            self.prefetch_git_history([result['file'] for result in unresolved])
+            for result in tqdm(unresolved, desc="📜 Git history", disable=len(unresolved) < 5):
+                self.add_git_suggestions(result)
+
+        if self.scan_cache is not None:
+            for file_path, result in scanned.items():
+                self.store_result(file_path, result, options)
+            print(f"💾 Scan cache: {len(cached)} unchanged files reused, {len(scanned)} scanned")
 
-                # Skip binary files and common non-text files
-                if self.is_likely_binary(file_path):
-                    continue
+        print(f"✅ Scanned {len(files_to_check)} files, found issues in {len(self.results)}")
+        self.print_encoding_tiers()
 
-                files_to_check.append(file_path)
+    def load_scan_cache(self, cache_path):
+        """Load the persistent scan cache; a missing, unreadable or outdated cache starts empty"""
+        self.scan_cache_path = Path(cache_path)
+        self.scan_cache = {}
+        try:
+            with open(self.scan_cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == SCAN_CACHE_VERSION:
+                self.scan_cache = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    def save_scan_cache(self):
+        """Write the scan cache atomically next to its final location"""
+        if self.scan_cache is None:
+            return
+        temp_path = self.scan_cache_path.with_name(self.scan_cache_path.name + '.tmp')
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': SCAN_CACHE_VERSION, 'files': self.scan_cache}, f)
+            os.replace(temp_path, self.scan_cache_path)
+        except OSError as e:
+            print(f"⚠️  Could not write scan cache {self.scan_cache_path}: {e}")
+
+    def scan_options_digest(self, enable_git_history):
+        """Version of everything besides file content that shapes a result: patterns and git modes"""
+        options = json.dumps([sorted(set(self.broken_patterns)), bool(enable_git_history and self.git_available),
+                              self.provenance, self.reverse_mojibake])
+        return hashlib.sha1(options.encode('utf-8')).hexdigest()[:16]
+
+    def file_digest(self, file_path):
+        """Content hash used when size matches but mtime moved (checkouts, touch)"""
+        digest = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def cached_result(self, file_path, options):
+        """Previous result for an unchanged file, None when it has to be scanned"""
+        entry = self.scan_cache.get(str(Path(file_path).resolve()))
+        if not entry or entry['options'] != options:
+            return None
+        try:
+            stat = os.stat(file_path)
+            if stat.st_size != entry['size']:
+                return None
+            if stat.st_mtime_ns != entry['mtime_ns']:
+                if self.file_digest(file_path) != entry['sha1']:
+                    return None
+                entry['mtime_ns'] = stat.st_mtime_ns
+        except OSError:
+            return None
+        return self.result_from_json(entry['result'])
+
+    def result_to_json(self, result):
+        """Scan result in the cache's JSON form; issues become [line, column, length, pattern, suggestion, provenance,
+        reversal]"""
+        data = dict(result)
+        data['issues'] = [[issue.line, issue.column, issue.length, self.pattern_table[issue.pattern_id],
+                           issue.git_suggestion, issue.provenance, issue.encoding_reversal]
+                          for issue in result['issues']]
+        return data
+
+    def result_from_json(self, data):
+        """Scan result rebuilt from the cache, with its issues interned into this searcher's tables"""
+        result = dict(data)
+        file_id = self.file_id(result['file'])
+        result['issues'] = []
+        for line, column, length, pattern, git_suggestion, provenance, encoding_reversal in data['issues']:
+            issue = IssueRecord(file_id, line, column, length, self.pattern_id(pattern))
+            issue.git_suggestion = git_suggestion
+            issue.provenance = provenance
+            issue.encoding_reversal = encoding_reversal
+            result['issues'].append(issue)
+        return result
+
+    def store_result(self, file_path, result, options):
+        """Remember a freshly scanned result under the file's current size, mtime and hash"""
+        try:
+            stat = os.stat(file_path)
+            self.scan_cache[str(Path(file_path).resolve())] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha1': self.file_digest(file_path),
+                'options': options,
+                'result': self.result_to_json(result)
+            }
+        except OSError:
+            pass
+
+    def discover_files(self, directory, recursive=True):
+        """List candidate files under directory, returning (paths, discovery method)
+
+        Inside a git work tree this is one `git ls-files` call (tracked plus
+        untracked-but-not-ignored files). Elsewhere an os.scandir walk prunes
+        excluded directories before descending into them.
+        """
+        files = self.list_files_from_git(directory, recursive)
+        if files is not None:
+            return files, "git ls-files"
+        return self.walk_files(directory, recursive), "directory walk"
 
-        print(f"📊 Found {files_found} files, will check {len(files_to_check)}")
+    def list_files_from_git(self, directory, recursive=True):
+        """Files git knows about under directory, None when it is not inside a work tree"""
+        try:
+            result = subprocess.run(['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard'],
+                                    capture_output=True, cwd=directory)
+        except OSError:
+            return None
+        if result.returncode != 0:
+            return None
 
-        # Second pass: check files with progress bar
-        if files_to_check:
-            with tqdm(files_to_check, desc="🔍 Scanning files", disable=len(files_to_check) < 5) as pbar:
-                for file_path in pbar:
-                    pbar.set_postfix_str(str(file_path.name))
-                    result = self.search_file(file_path, enable_git_history=enable_git_history)
-                    if result['issues'] or result['errors']:
-                        self.results.append(result)
+        files = []
+        for name in dict.fromkeys(result.stdout.decode('utf-8', errors='surrogateescape').split('\0')):
+            if not name or (not recursive and '/' in name):
+                continue
+            parts = name.split('/')
+            if any(part in self.excluded_dirs for part in parts[:-1]):
+                continue
+            file_path = directory / name
+            if file_path.is_file():  # Deleted but still in the index
+                files.append(file_path)
+        return files
+
+    def walk_files(self, directory, recursive=True):
+        """os.scandir walk that never descends into excluded directories"""
+        files = []
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and entry.name not in self.excluded_dirs and entry.name != '.git':
+                                pending.append(Path(entry.path))
+                        elif entry.is_file():
+                            files.append(Path(entry.path))
+            except OSError:
+                continue
+        return files
 
-        print(f"✅ Scanned {len(files_to_check)} files, found issues in {len(self.results)}")
+    def search_files_parallel(self, files_to_check, jobs):
+        """Scan files in a process pool, returning their results in input order
+
+        Workers never call git: with N workers that would mean N concurrent
+        git processes. search_directory adds git suggestions afterwards in this
+        process, in one batch, and only for files that actually have issues.
+        """
+        print(f"🧵 Scanning with {jobs} worker processes")
+        results = []
+        chunksize = max(1, min(32, len(files_to_check) // (jobs * 4)))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(self.broken_patterns, self.default_patterns,
+                                           self.reverse_mojibake)) as executor:
+            scanned = executor.map(_scan_in_worker, files_to_check, chunksize=chunksize)
+            with tqdm(total=len(files_to_check), desc="🔍 Scanning files", disable=len(files_to_check) < 5) as pbar:
+                for file_path, (result, encoding_tiers, pattern_table) in zip(files_to_check, scanned):
+                    pbar.update(1)
+                    pbar.set_postfix_str(file_path.name)
+                    self.encoding_tiers.update(encoding_tiers)
+                    self.adopt_result(result, pattern_table)
+                    results.append(result)
+        return results
+
+    def adopt_result(self, result, pattern_table):
+        """Re-key a worker's issue records from its file and pattern tables to this searcher's"""
+        file_id = self.file_id(result['file'])
+        for issue in result['issues']:
+            issue.file_id = file_id
+            issue.pattern_id = self.pattern_id(pattern_table[issue.pattern_id])
+
+    def print_encoding_tiers(self):
+        """Report how many files each encoding detection tier classified"""
+        tier_names = [('binary', 'binary (skipped)'), ('byte-scan', 'byte-level fast path'), ('bom', 'BOM'),
+                      ('utf-8-strict', 'strict UTF-8'), ('charset-normalizer', 'charset-normalizer'),
+                      ('chardet', 'chardet')]
+        counts = [f"{label} {self.encoding_tiers[tier]}" for tier, label in tier_names if self.encoding_tiers[tier]]
+        if counts:
+            print(f"🔤 Encoding tiers: {', '.join(counts)}")
 
     def is_likely_binary(self, file_path):
         """Check if file is likely binary"""
@@ -475,115 +1452,208 @@ class BrokenUnicodeSearcher:
 
         return False
 
-    def fix_file(self, file_path, backup=True, use_git_suggestions=True):
-        """Attempt to fix broken unicode in a file using git history when possible"""
-        if backup:
-            backup_path = f"{file_path}.unicode_backup_{int(datetime.now().timestamp())}"
-            shutil.copy2(file_path, backup_path)
-            print(f"📄 Created backup: {backup_path}")
-
-        # First, analyze the file to get git suggestions
-        file_results = self.search_file(file_path)
-
-        # Use the same encoding that was used during search
-        used_encoding = 'utf-8'
+    def plan_fixes(self, file_results, content, use_git_suggestions=True):
+        """Replacements for one scanned file as (start offset, end offset, replacement, line, source), in offset order"""
+        line_starts = self.build_line_index(content)
+        fixes = []
         for issue in file_results['issues']:
-            if issue.get('encoding_used'):
-                used_encoding = issue['encoding_used']
-                break
+            if issue.line > len(line_starts):
+                continue
+            start = line_starts[issue.line - 1] + issue.column - 1
+            end = start + issue.length
+            broken = content[start:end]
+            # A file edited since it was scanned must not be patched at stale offsets
+            if issue.encoding_reversal is not None:
+                if broken != issue.encoding_reversal['original']:
+                    continue
+            elif not re.match(self.pattern_table[issue.pattern_id], broken):
+                continue
+
+            # A verified byte-level reversal of the exact span beats a similarity match from history;
+            # medium-confidence reversals are only shown, never applied
+            replacement = None
+            source = None
+            suggested = self.suggested_replacement(issue, broken) if use_git_suggestions else None
+            if issue.encoding_reversal is not None and issue.encoding_reversal['confidence'] == 'high':
+                replacement = issue.encoding_reversal['restored']
+                source = 'reversal'
+            elif suggested is not None:
+                replacement = suggested
+                source = 'git'
+            elif '\ufffd' in broken:
+                # Fallback: drop replacement characters nothing can restore
+                replacement = broken.replace('\ufffd', '')
+                source = 'fallback'
+
+            if isinstance(replacement, str) and replacement != broken:
+                fixes.append((start, end, replacement, issue.line, source))
+        fixes.sort()
+        return fixes
+
+    def raw_text_fixes(self, raw_text, content, fixes):
+        """Fixes planned on newline-translated content, moved to the same places in the untranslated raw_text"""
+        line_starts = self.build_line_index(content)
+        raw_line_starts = [0] + [match.end() for match in re.finditer(r'\r\n|\r|\n', raw_text)]
+
+        def raw_offset(offset):
+            line_index = bisect_right(line_starts, offset) - 1
+            return raw_line_starts[line_index] + offset - line_starts[line_index]
+
+        return [(raw_offset(start), raw_offset(end), replacement, line, source)
+                for start, end, replacement, line, source in fixes]
+
+    def apply_fixes(self, content, fixes):
+        """Apply non-overlapping offset replacements to the text in one pass"""
+        pieces = []
+        position = 0
+        for start, end, replacement, _, _ in fixes:
+            pieces.append(content[position:start])
+            pieces.append(replacement)
+            position = end
+        pieces.append(content[position:])
+        return ''.join(pieces)
+
+    def backup_file(self, file_path, raw_data):
+        """Add a file's original bytes to this run's backup archive, created on first use"""
+        if self.backup_archive is None:
+            self.backup_archive_path = Path(f"unicode_backup_{int(datetime.now().timestamp())}.tar.gz")
+            self.backup_archive = tarfile.open(self.backup_archive_path, 'w:gz')
+        archive_name = os.path.relpath(os.path.abspath(file_path))
+        if archive_name.startswith('..'):
+            archive_name = os.path.abspath(file_path).lstrip(os.sep)
+        info = tarfile.TarInfo(archive_name)
+        stat = os.stat(file_path)
+        info.size = len(raw_data)
+        info.mtime = stat.st_mtime
+        info.mode = stat.st_mode & 0o777
+        self.backup_archive.addfile(info, io.BytesIO(raw_data))
+        self.backup_count += 1
+
+    def close_backup_archive(self):
+        """Finish this run's backup archive, if any file was backed up"""
+        if self.backup_archive is None:
+            return
+        self.backup_archive.close()
+        self.backup_archive = None
+        print(f"📄 Backed up {self.backup_count} original file(s) to: {self.backup_archive_path}")
+
+    def fix_file(self, file_path, backup=True, use_git_suggestions=True, file_results=None, dry_run=False):
+        """Fix broken unicode in a file from its scan results, preferring git history suggestions
+
+        file_results is what search_file already produced for the file; the file
+        is only scanned again when it is not given. All replacements are applied
+        by offset in one pass and the result replaces the file atomically, in the
+        file's own encoding and line endings. With dry_run nothing is written and
+        a unified diff of the exact bytes that would be written is printed instead.
+        """
+        if file_results is None:
+            file_results = self.search_file(file_path)
 
-        # Read file with replacement characters using the same encoding as search
         try:
-            with open(file_path, 'r', encoding=used_encoding, errors='replace') as f:
-                lines = f.readlines()
-        except Exception as e:
+            raw_data = self.read_bytes(file_path)
+        except OSError as e:
             print(f"❌ Could not read file: {e}")
             return False
 
-        original_lines = lines.copy()
-        changes_made = False
-
-        # Apply git-based fixes first if available
-        if use_git_suggestions and self.git_available:
-            for issue in file_results['issues']:
-                if issue['type'] == 'broken_unicode' and 'git_suggestion' in issue:
-                    line_num = issue['line'] - 1  # Convert to 0-based index
-                    if line_num < len(lines):
-                        suggestion = issue['git_suggestion']
-                        old_line = lines[line_num]
-
-                        # Apply the git suggestions
-                        broken_pattern = issue['match']  # The actual broken pattern that was found
-
-                        if isinstance(suggestion['suggestion'], dict) and suggestion['suggestion']:
-                            # Get the first suggested replacement character
-                            replacement_char = list(suggestion['suggestion'].values())[0]
-
-                            # For �� characters, replace directly
-                            if broken_pattern == '�' and '�' in old_line:
-                                new_line = old_line.replace('�', replacement_char, 1)
-                                if new_line != old_line:
-                                    lines[line_num] = new_line
-                                    changes_made = True
-                                    print(f"   ✨ Applied git suggestion on line {issue['line']}: � → {replacement_char}")
-
-                            # For other patterns, try to replace the pattern directly
-                            elif broken_pattern in old_line and isinstance(replacement_char, str):
-                                new_line = old_line.replace(broken_pattern, replacement_char, 1)
-                                if new_line != old_line:
-                                    lines[line_num] = new_line
-                                    changes_made = True
-                                    print(f"   ✨ Applied git suggestion on line {issue['line']}: {broken_pattern} → {replacement_char}")
-
-        # Apply encoding reversal fixes
-        # Disabled: Windows-1254 reversal causes false positives on normal unicode text
-        # if use_git_suggestions:  # Use same flag for encoding reversals
-        #     for issue in file_results['issues']:
-        #         if issue['type'] == 'broken_unicode' and 'encoding_reversal' in issue:
-        #             line_num = issue['line'] - 1
-        #             if line_num < len(lines):
-        #                 reversal = issue['encoding_reversal']
-        #                 old_line = lines[line_num]
-        #                 pattern = issue['pattern']
-        #
-        #                 # Only replace the specific pattern, not the entire line
-        #                 new_line = old_line.replace(pattern, reversal['restored'])
-        #
-        #                 if new_line != old_line:
-        #                     lines[line_num] = new_line
-        #                     changes_made = True
-        #                     print(f"   🔄 Applied encoding reversal on line {issue['line']}: {pattern} → {reversal['restored']}")
-
-        # Apply fallback fixes for any remaining issues
-        fallback_fixes = {
-            '�': '',  # Remove lone replacement characters
-            '��': '',  # Remove double replacement
-            '���': '', # Remove triple replacement
-        }
-
-        for i, line in enumerate(lines):
-            original_line = line
-            for broken, replacement in fallback_fixes.items():
-                line = line.replace(broken, replacement)
-            if line != original_line:
-                lines[i] = line
-                changes_made = True
-
-        if changes_made:
+        # Offsets refer to the text exactly as the scan decoded it
+        encoding = file_results['encoding_used'] or 'utf-8'
+        content = self.decode_text(raw_data, encoding)
+        fixes = []
+        for fix in self.plan_fixes(file_results, content, use_git_suggestions):
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.writelines(lines)
-                print(f"✅ Fixed unicode issues in: {file_path}")
-                return True
-            except Exception as e:
-                print(f"❌ Could not write fixed file: {e}")
-                return False
-        else:
+                fix[2].encode(encoding)
+                fixes.append(fix)
+            except UnicodeEncodeError:
+                print(f"   ⚠️  Skipped fix on line {fix[3]}: {fix[2]!r} cannot be written as {encoding}")
+        if not fixes:
             print(f"ℹ️  No fixes needed for: {file_path}")
             return True
 
+        # The fixes go into the text with its original line endings, written back in the file's encoding
+        raw_text = codecs.decode(raw_data, encoding, errors='replace')
+        fixed_data = self.apply_fixes(raw_text, self.raw_text_fixes(raw_text, content, fixes)).encode(
+            encoding, errors='replace')
+
+        if dry_run:
+            name = os.fsencode(str(file_path))
+            sys.stdout.flush()
+            for line in difflib.diff_bytes(difflib.unified_diff, raw_data.splitlines(keepends=True),
+                                           fixed_data.splitlines(keepends=True), fromfile=name, tofile=name):
+                if not line.endswith((b'\n', b'\r')):
+                    line += b'\n\\ No newline at end of file\n'
+                sys.stdout.buffer.write(line)
+            sys.stdout.buffer.flush()
+            return True
+
+        for start, end, replacement, line, source in fixes:
+            if source == 'git':
+                print(f"   ✨ Applied git suggestion on line {line}: {content[start:end]} → {replacement}")
+            elif source == 'reversal':
+                print(f"   🔄 Applied encoding reversal on line {line}: {content[start:end]} → {replacement}")
+
+        if backup:
+            self.backup_file(file_path, raw_data)
+
+        # Write next to the original and rename over it, so an interrupted run never leaves a partial file
+        temp_path = Path(file_path).with_name(Path(file_path).name + '.unicode_fix.tmp')
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(fixed_data)
+            shutil.copymode(file_path, temp_path)
+            os.replace(temp_path, file_path)
+            # The report reads flagged lines after this; keep just those, as they were scanned
+            lines = content.split('\n')
+            self.scanned_lines[str(file_path)] = {issue.line: lines[issue.line - 1]
+                                                  for issue in file_results['issues'] if issue.line <= len(lines)}
+        except OSError as e:
+            print(f"❌ Could not write fixed file: {e}")
+            if temp_path.exists():
+                temp_path.unlink()
+            return False
+        print(f"✅ Fixed unicode issues in: {file_path}")
+        return True
+
+    def issue_lines(self, result, with_text=True):
+        """Yield (issue, line content) for one result; the file is read once, and only when with_text
+
+        Files fix_file has rewritten report the flagged lines it kept from the scan.
+        """
+        flagged = self.scanned_lines.get(str(result['file']))
+        if flagged is not None:
+            for issue in result['issues']:
+                yield issue, flagged.get(issue.line, '') if with_text else ''
+            return
+        lines = self.read_lines(result) if with_text and result['issues'] else []
+        for issue in result['issues']:
+            yield issue, lines[issue.line - 1] if issue.line <= len(lines) else ''
+
+    def write_json(self, json_path):
+        """Stream the issues as JSON Lines, one object per occurrence, reading one flagged file at a time"""
+        count = 0
+        with open(json_path, 'w', encoding='utf-8') as out:
+            for result in self.results:
+                for issue, line_content in self.issue_lines(result):
+                    record = {
+                        'file': result['file'],
+                        'line': issue.line,
+                        'column': issue.column,
+                        'pattern': self.pattern_table[issue.pattern_id],
+                        'match': issue.match_in(line_content),
+                        'context': line_content.strip(),
+                        'encoding': result['encoding_used']
+                    }
+                    if issue.git_suggestion is not None:
+                        record['git_suggestion'] = issue.git_suggestion
+                    if issue.provenance is not None:
+                        record['provenance'] = issue.provenance
+                    if issue.encoding_reversal is not None:
+                        record['encoding_reversal'] = issue.encoding_reversal
+                    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    count += 1
+        print(f"📝 Wrote {count} issues to {json_path}")
+
     def print_results(self, verbose=False):
-        """Print search results"""
+        """Print search results, streaming each file's issues with context sliced from the file on demand"""
         if not self.results:
             print("✅ No broken unicode characters found!")
             return
@@ -592,6 +1662,8 @@ class BrokenUnicodeSearcher:
         print("=" * 60)
 
         total_issues = 0
+        total_fixable = 0
+        introduced_by = Counter()
 
         for result in self.results:
             file_path = result['file']
@@ -610,53 +1682,82 @@ class BrokenUnicodeSearcher:
                 for error in errors:
                     print(f"   ❌ {error}")
 
-            if issues:
-                issue_count = len([i for i in issues if i['type'] == 'broken_unicode'])
-                total_issues += issue_count
-
-                for issue in issues:
-                    if issue['type'] == 'broken_unicode':
-                        line = issue['line']
-                        col = issue['column']
-                        pattern = issue['pattern']
-                        context = issue['context'][:60] + "..." if len(issue['context']) > 60 else issue['context']
-
-                        print(f"   🔸 Line {line}:{col} - Pattern: {repr(pattern)}")
-                        if verbose:
-                            print(f"      Context: {repr(context)}")
-
-                        # Show git history suggestion if available
-                        if 'git_suggestion' in issue:
-                            suggestion = issue['git_suggestion']
-                            print(f"      💡 Git suggests: {suggestion['suggestion']} (from commit {suggestion['commit']})")
-                            if verbose:
-                                print(f"      📝 Original line: {repr(suggestion['historical_line'][:60])}")
-
-                        # Show encoding reversal suggestion if available
-                        if 'encoding_reversal' in issue:
-                            reversal = issue['encoding_reversal']
-                            print(f"      🔄 Encoding reversal: {repr(reversal['restored'])} (method: {reversal['method']}, confidence: {reversal['confidence']})")
-
-                    elif issue['type'] == 'encoding_uncertainty':
-                        print(f"   ⚠️  {issue['message']}")
-
-        # Calculate auto-fix statistics
-        total_fixable = 0
-        for result in self.results:
-            for issue in result['issues']:
-                if issue['type'] == 'broken_unicode':
-                    # Count issues that have git suggestions or encoding reversals
-                    if 'git_suggestion' in issue or 'encoding_reversal' in issue:
-                        total_fixable += 1
+            for warning in result['warnings']:
+                print(f"   ⚠️  {warning}")
+
+            total_issues += len(issues)
+            # The file is only read again when something below shows its text
+            with_text = verbose or any(issue.git_suggestion is not None for issue in issues)
+
+            for issue, line_content in self.issue_lines(result, with_text):
+                pattern = self.pattern_table[issue.pattern_id]
+                print(f"   🔸 Line {issue.line}:{issue.column} - Pattern: {repr(pattern)}")
+                if verbose:
+                    context = line_content.strip()
+                    context = context[:60] + "..." if len(context) > 60 else context
+                    print(f"      Context: {repr(context)}")
+
+                # Show git history suggestion if available
+                if issue.git_suggestion is not None:
+                    suggestion = issue.git_suggestion
+                    match = issue.match_in(line_content)
+                    suggested = self.suggested_replacement(issue, match)
+                    if suggested is not None:
+                        print(f"      💡 Git suggests: {match!r} → {suggested!r} "
+                              f"(from commit {suggestion['commit']}, similarity {suggestion['similarity']:.2f})")
+                    else:
+                        print(f"      💡 Git suggests: {suggestion['suggestion']} (from commit {suggestion['commit']})")
+                    if verbose:
+                        print(f"      📝 Original line: {repr(suggestion['historical_line'][:60])}")
+
+                if issue.provenance is not None:
+                    provenance = issue.provenance
+                    print(f"      🧬 Introduced by {provenance['commit']} ({provenance['author']}, "
+                          f"{provenance['date']}): {provenance['summary'][:60]}")
+                    introduced_by[(provenance['commit'], provenance['summary'])] += 1
+
+                # Show encoding reversal suggestion if available
+                if issue.encoding_reversal is not None:
+                    reversal = issue.encoding_reversal
+                    print(f"      🔄 Encoding reversal: {repr(reversal['restored'])} (method: {reversal['method']}, confidence: {reversal['confidence']})")
+
+                # Count issues that have git suggestions or encoding reversals
+                if (issue.encoding_reversal or {}).get('confidence') == 'high' \
+                        or (issue.git_suggestion or {}).get('pieces'):
+                    total_fixable += 1
 
         fix_percentage = (total_fixable / total_issues * 100) if total_issues > 0 else 0
 
+        if introduced_by:
+            print("\n🧬 Corruption introduced by:")
+            for (commit, summary), count in introduced_by.most_common(10):
+                print(f"   {commit} {summary[:60]} - {count} occurrences")
+
         print(f"\n📊 Total: {total_issues} broken unicode occurrences in {len(self.results)} files")
         print(f"🔧 Auto-fixable: {total_fixable} issues ({fix_percentage:.1f}%)")
 
         if total_fixable > 0:
             print(f"💡 Run with --fix to automatically repair {total_fixable} issues")
 
+_worker_searcher = None
+
+
+def _init_worker(patterns, default_patterns, reverse_mojibake):
+    """Process pool initializer: one searcher per worker, without git"""
+    global _worker_searcher
+    _worker_searcher = BrokenUnicodeSearcher(check_git=False)
+    _worker_searcher.broken_patterns = list(patterns)
+    _worker_searcher.default_patterns = list(default_patterns)
+    _worker_searcher.reverse_mojibake = reverse_mojibake
+
+
+def _scan_in_worker(file_path):
+    """Scan one file in a worker, returning (result, encoding tiers it went through, pattern table)"""
+    _worker_searcher.encoding_tiers.clear()
+    result = _worker_searcher.search_file(file_path, enable_git_history=False)
+    return result, dict(_worker_searcher.encoding_tiers), _worker_searcher.pattern_table if result['issues'] else None
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Search for broken unicode characters in files",
@@ -668,8 +1769,13 @@ Examples:
   search_broken_unicode.py --fast --recursive .  # Fast mode, no git
   search_broken_unicode.py --pattern "��" --verbose .
   search_broken_unicode.py --fix broken_file.txt
-  search_broken_unicode.py --fix --backup broken_file.txt  # Create backup
+  search_broken_unicode.py --fix --backup broken_file.txt  # Back up originals into one .tar.gz per run
+  search_broken_unicode.py --fix --dry-run -r src/  # Show the fixes as a unified diff
   search_broken_unicode.py --extensions .py,.js,.html src/
+  search_broken_unicode.py --jobs 0 --recursive .  # One worker per CPU
+  search_broken_unicode.py --provenance --recursive .  # Which commit introduced each corruption
+  search_broken_unicode.py --cache .unicode-scan.json -r .  # Nightly runs only read changed files
+  search_broken_unicode.py --json issues.jsonl -r .  # Machine-readable report
 
 Performance options:
   --fast          Skip git history (fastest)
@@ -728,6 +1834,12 @@ Common patterns searched:
         help='Do not create backup when fixing (default: no backup)'
     )
 
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='With --fix: print a unified diff of the fixes instead of writing them'
+    )
+
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -753,7 +1865,40 @@ Common patterns searched:
         help='Disable git history suggestions (faster)'
     )
 
+    parser.add_argument(
+        '--no-reversal',
+        action='store_true',
+        help='Do not detect or reverse double-encoded UTF-8 (cp1252, latin-1, cp1254 mojibake)'
+    )
+
+    parser.add_argument(
+        '--provenance',
+        action='store_true',
+        help='Blame each corrupted line: report the commit that introduced it and take the original from its parent'
+    )
+
+    parser.add_argument(
+        '--cache',
+        metavar='PATH',
+        help='Persistent scan cache: unchanged files reuse their previous results without being read'
+    )
+
+    parser.add_argument(
+        '--json',
+        metavar='PATH',
+        help='Also write every issue to PATH as JSON Lines (one object per occurrence)'
+    )
+
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Scan files in N worker processes (0 = one per CPU, default: 1)'
+    )
+
     args = parser.parse_args()
+    if args.dry_run and not args.fix:
+        parser.error("--dry-run requires --fix")
 
     # Handle backup option
     backup = args.backup and not args.no_backup
@@ -774,24 +1919,32 @@ Common patterns searched:
         if args.fast:
             print("⚡ Fast mode: skipping git history lookups")
 
+    if args.no_reversal:
+        searcher.reverse_mojibake = False
+
     # Add custom patterns
     if args.pattern:
         searcher.broken_patterns.extend(args.pattern)
 
     path = Path(args.path)
     enable_git = searcher.git_available and not args.fast and not args.no_git
+    searcher.provenance = args.provenance and enable_git
 
     if path.is_file():
         print(f"🔍 Searching file: {path}")
         result = searcher.search_file(path, check_encoding=args.encoding_check, enable_git_history=enable_git)
-        if result['issues'] or result['errors']:
+        if result['issues'] or result['warnings'] or result['errors']:
             searcher.results.append(result)
 
         if args.fix and result['issues']:
-            searcher.fix_file(path, backup=backup)
+            searcher.fix_file(path, backup=backup, file_results=result, dry_run=args.dry_run)
 
     elif path.is_dir():
-        searcher.search_directory(path, recursive=args.recursive, extensions=extensions, enable_git_history=enable_git)
+        if args.cache:
+            searcher.load_scan_cache(args.cache)
+        jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        searcher.search_directory(path, recursive=args.recursive, extensions=extensions, enable_git_history=enable_git,
+                                  jobs=jobs)
 
         if args.fix and searcher.results:
             print(f"\n🔧 Fixing {len(searcher.results)} files...")
@@ -799,13 +1952,20 @@ Common patterns searched:
                 for result in pbar:
                     if result['issues']:
                         pbar.set_postfix_str(Path(result['file']).name)
-                        searcher.fix_file(result['file'], backup=backup)
+                        searcher.fix_file(result['file'], backup=backup, file_results=result,
+                                          dry_run=args.dry_run)
     else:
         print(f"❌ Path does not exist: {path}")
         sys.exit(1)
 
+    searcher.close_backup_archive()
+    searcher.close_git()
+    searcher.save_scan_cache()
+
     # Print results
     searcher.print_results(verbose=args.verbose)
+    if args.json:
+        searcher.write_json(args.json)
 
 if __name__ == "__main__":
     main()
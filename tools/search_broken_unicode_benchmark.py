@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the mojibake reversal engine of search_broken_unicode.py
+
+Builds a multi-megabyte corpus from the legitimate multilingual sentences
+below, plus copies of them double-encoded through cp1252, latin-1 and cp1254,
+then reports:
+    - false positives: runs the engine wants to reverse in legitimate text, both
+      in the sentences above and in held-out strings the heuristics were not
+      tuned on, where only reversals --fix would apply count as failures
+    - recovery: mis-decoded sentences restored exactly
+    - throughput of the engine next to a plain finditer of the default patterns
+      and next to the byte-level prefilter used by the fast path
+
+Usage:
+    search_broken_unicode_benchmark.py
+    search_broken_unicode_benchmark.py --size-mb 32 --seed 7
+"""
+
+import sys
+import os
+import argparse
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from search_broken_unicode import BrokenUnicodeSearcher
+
+# Legitimate text, including the shapes closest to mojibake: accented capitals next to
+# typographic quotes, ellipses and dashes, prices, symbols and scripts whose UTF-8
+# bytes would decode to Latin-1 letters
+LEGITIMATE = [
+    "The naïve café owner’s résumé listed a façade renovation — twice.",
+    "Zürich, Köln und München: „Grüße aus Österreich“, sagte der Fuß“ball“-Fan.",
+    "Er schrieb „Gruß“ und „Straße“ in GROSSBUCHSTABEN: GRUSS, STRASSE, FUẞ.",
+    "« Voilà… » dit-il, « le café… » puis « l’été à Montréal ».",
+    "Œuvre complète, cœur d’artichaut, Ÿ majuscule, «CAFÉ» et «ÇA VA».",
+    "¿Dónde está el Ñandú? ¡Año nuevo en España, señor Muñoz!",
+    "São Paulo, ação, coração, IRMÃ” e “SÃO” em maiúsculas, pão e maçã.",
+    "Příliš žluťoučký kůň úpěl ďábelské ódy.",
+    "Zażółć gęślą jaźń — Łódź, Gdańsk, Kraków.",
+    "Árvíztűrő tükörfúrógép, Őrség és Ügyfélszolgálat.",
+    "Ångström, Øresund, Æsir, Þór og Ðiðrik í Reykjavík.",
+    "İstanbul’da ılık bir gün; Şişli, Ğ ve ğ harfleri, Çağrı’nın üç şeyi.",
+    "România: ș și ț, Brașov, Timișoara, Țara Românească.",
+    "Tiếng Việt có dấu: Hà Nội, Đà Nẵng, Huế, phở bò.",
+    "Ελληνικά: Καλημέρα κόσμε, ΑΘΗΝΑ, ψυχή.",
+    "Русский текст: Привет, мир! Съешь же ещё этих мягких французских булок.",
+    "Українська: Ґанок, їжак, Єва, пʼять.",
+    "עברית: שלום עולם, ירושלים.",
+    "العربية: مرحبا بالعالم، القاهرة.",
+    "हिन्दी: नमस्ते दुनिया।",
+    "ภาษาไทย: สวัสดีชาวโลก",
+    "日本語のテキスト：東京、ひらがな、カタカナ、漢字。",
+    "中文文本：你好，世界。北京欢迎你。",
+    "한국어 텍스트: 안녕하세요 세계.",
+    "Emoji: 😀 🎉 👩‍💻 🇫🇷 ❤️ ✔️ ☕",
+    "Prices: 5 €, £10, ¥500, 12,50 €/kg, ±0.5 °C, ½ cup, 3×4 m², 10 µs.",
+    "Legal: ©2024 ACME™, ® registered, § 12 Abs. 3, ¶ 4, † 1901, ‰ rate.",
+    "Math: α + β = γ, ∑ x², √2 ≈ 1.414, ∞ ≠ ∅, 2×3÷6.",
+    "Typography: “double”, ‘single’, ‹angle›, «guillemets», — em – en … ellipsis • bullet.",
+    "Mixed: ÀÉÎÕÜ àéîõü, ÁÍÓÚ áíóú, Ä“Ö”Ü» and ß” at word ends.",
+]
+
+# Legitimate text kept out of the tuning: quoted single capitals, accented capitals next to
+# the euro sign, bullets, trademarks and dashes. Lone two-character runs here may be flagged
+# with medium confidence, but must never be reported alone or reach --fix
+HELD_OUT = [
+    "La letra “Ñ” es española, y “Ó” también.",
+    "the letter “Ó” here, and ‘Ú’ there",
+    "Grade “É” students; marks “Á”, “Í” and “Ú”.",
+    "Preis: É€ 5, Ó€ 10, Ú€ 3 (Kürzel vor dem Eurozeichen).",
+    "MENU: CAFÉ• THÉ• JUS• — prix ÉTÉ•HIVER",
+    "Ó• item, Ö• Punkt, Ñ• viñeta, Ç• madde",
+    "MARCA Å™, ÄŒ and Ã— are stray pairs in a legitimate table",
+    "«Ê» ‘Ó’ “Â” “Ê” «Ô» ‹Ú›",
+    "ÉCOLE—2024, ÎLE–DE–FRANCE…, ÇA‰",
+    "Résumé: “Ø” and “Å” are Nordic letters, “Ð” is eth.",
+]
+
+
+def mis_decode(text, encoding):
+    """UTF-8 bytes of text decoded through a single-byte codec, undefined bytes kept as C1 controls"""
+    return ''.join(bytes([byte]).decode(encoding, errors='ignore') or chr(byte) for byte in text.encode('utf-8'))
+
+
+def build_corpus(size_bytes, seed, source_like=False):
+    """Legitimate text of about size_bytes UTF-8 bytes, in random sentence order
+
+    source_like builds JavaScript-looking lines instead, with a sentence in a
+    string literal on one line in fifty.
+    """
+    rng = random.Random(seed)
+    lines = []
+    total = 0
+    while total < size_bytes:
+        if source_like:
+            index = len(lines)
+            text = rng.choice(LEGITIMATE) if index % 50 == 0 else f"value {index} for the carpool matcher"
+            line = f"    const label{index} = formatLabel('{text}', {{ index: {index}, enabled: true }});"
+        else:
+            line = rng.choice(LEGITIMATE)
+        lines.append(line)
+        total += len(line.encode('utf-8')) + 1
+    return '\n'.join(lines) + '\n'
+
+
+def mis_decode_lines(text, every):
+    """text with every n-th line mis-decoded through cp1252 (sentence lines only, for source-like text)"""
+    lines = text.split('\n')
+    for index in range(0, len(lines), every):
+        lines[index] = mis_decode(lines[index], 'cp1252')
+    return '\n'.join(lines)
+
+
+def measure(function, repeat=3):
+    """Best wall time of function over repeat runs, with its last result"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the mojibake reversal engine")
+    parser.add_argument('--size-mb', type=float, default=8, help='Corpus size in MB (default: 8)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for sentence order (default: 1)')
+    args = parser.parse_args()
+
+    searcher = BrokenUnicodeSearcher(check_git=False)
+
+    # False positives: nothing in legitimate text may be reversed
+    false_positives = []
+    for sentence in LEGITIMATE:
+        for start, end, restored, encoding, _ in searcher.find_mojibake(sentence):
+            false_positives.append((sentence[start:end], restored, encoding))
+    print(f"🧪 Legitimate sentences: {len(LEGITIMATE)}, false positives: {len(false_positives)}")
+    for original, restored, encoding in false_positives:
+        print(f"   ❌ {original!r} → {restored!r} ({encoding})")
+
+    # Held-out text: lone pairs may be flagged, anything --fix would apply is a false positive
+    flagged = 0
+    held_out_false_positives = []
+    for sentence in HELD_OUT:
+        for run in searcher.find_mojibake(sentence):
+            start, end, restored, encoding, _ = run
+            if searcher.reversal_for_span(sentence[start:end], start, [run])['confidence'] == 'high':
+                held_out_false_positives.append((sentence[start:end], restored, encoding))
+            else:
+                flagged += 1
+    print(f"🧪 Held-out strings: {len(HELD_OUT)}, false positives: {len(held_out_false_positives)} "
+          f"({flagged} lone pairs flagged with medium confidence, never applied)")
+    for original, restored, encoding in held_out_false_positives:
+        print(f"   ❌ {original!r} → {restored!r} ({encoding})")
+
+    # Recovery: every sentence double-encoded through each codec, and twice through cp1252
+    recovered = 0
+    attempted = 0
+    misses = []
+    for sentence in LEGITIMATE:
+        variants = [(encoding, mis_decode(sentence, encoding)) for encoding in searcher.mojibake_encodings]
+        variants.append(('cp1252 twice', mis_decode(mis_decode(sentence, 'cp1252'), 'cp1252')))
+        for label, broken in variants:
+            if broken == sentence:
+                continue
+            attempted += 1
+            found = searcher.find_mojibake(broken)
+            if found and searcher.reversal_for_span(broken, 0, found)['restored'] == sentence:
+                recovered += 1
+            else:
+                misses.append((label, sentence))
+    print(f"🔄 Mis-decoded sentences restored exactly: {recovered}/{attempted}")
+    for label, sentence in misses:
+        print(f"   ⚠️  {label}: {sentence[:60]!r}")
+
+    # Throughput on multi-megabyte text; the default patterns' combined regex is the baseline
+    size_bytes = int(args.size_mb * 1024 * 1024)
+    combined, _ = searcher.compile_patterns(searcher.default_patterns)
+    corpora = [
+        ('multilingual prose, 1 line in 10 mis-decoded',
+         mis_decode_lines(build_corpus(size_bytes, args.seed), 10)),
+        ('source code, 1 line in 100 mis-decoded',
+         mis_decode_lines(build_corpus(size_bytes, args.seed, source_like=True), 100)),
+    ]
+    for label, text in corpora:
+        size_mb = len(text.encode('utf-8')) / (1024 * 1024)
+        print(f"\n⏱️  {label}: {size_mb:.1f} MB")
+        for name, function in [('default patterns', lambda: sum(1 for _ in combined.finditer(text))),
+                               ('reversal engine', lambda: len(searcher.find_mojibake(text)))]:
+            searcher.reversal_cache.clear()
+            elapsed, count = measure(function)
+            print(f"   {name:<18} {elapsed:7.3f}s  {size_mb / elapsed:8.1f} MB/s  ({count} matches)")
+
+    # Legitimate text end to end: how often the byte prefilter sends it to the slow path, and what the engine reverses
+    legitimate = build_corpus(size_bytes, args.seed)
+    legitimate_bytes = legitimate.encode('utf-8')
+    elapsed, candidates = measure(lambda: len(searcher.mojibake_prefilter.findall(legitimate_bytes)))
+    legitimate_runs = searcher.find_mojibake(legitimate)
+    print(f"\n🧹 Legitimate corpus: {len(legitimate_bytes) / (1024 * 1024):.1f} MB, byte prefilter "
+          f"{elapsed:.3f}s ({candidates} candidate spots), runs reversed: {len(legitimate_runs)}")
+
+    sys.exit(1 if false_positives or held_out_false_positives or legitimate_runs else 0)
+
+
+if __name__ == "__main__":
+    main()